@@ -1,7 +1,9 @@
 from statistics import mean
 from math import sqrt
-from scipy.stats import norm
-import matplotlib.pyplot as plt
+from critical_values import norm_ppf
+import numpy as np
+from plotting import pyplot, show_or_save
+from running_moments import RunningMoments
 
 # Clase que implementa la prueba de promedio para una secuencia de números
 class AverageTest:
@@ -20,11 +22,11 @@ class AverageTest:
     # Calcula el promedio de la lista de números
     def compute_average(self):
         if self.n:
-            self.average = mean(self.numbers)
+            self.average = float(np.mean(self.numbers)) if isinstance(self.numbers, np.ndarray) else mean(self.numbers)
 
     # Calcula el valor Z a partir de alpha
     def compute_z(self):
-        self.z = norm.ppf(1 - (self.alpha / 2))
+        self.z = norm_ppf(1 - (self.alpha / 2))
 
     # Calcula el límite superior de la prueba
     def compute_upper_limit(self):
@@ -55,7 +57,8 @@ class AverageTest:
         self.lower_limit = 0.0
 
     # Genera un gráfico de barras que muestra el límite inferior, el promedio y el límite superior
-    def plot_graph(self):
+    def plot_graph(self, path=None):
+        plt = pyplot(headless=path is not None)
         categories = ["Límite Inferior", "Promedio", "Límite Superior"]
         values = [self.lower_limit, self.average, self.upper_limit]
         fig, ax = plt.subplots()
@@ -67,7 +70,40 @@ class AverageTest:
         for bar, value in zip(bars, values):
             ax.annotate(str(round(value, 4)), xy=(bar.get_x() + bar.get_width() / 2, value),
                         xytext=(0, 1), textcoords="offset points", ha="center", va="bottom")
-        plt.show()
+        show_or_save(plt, path)
+
+# Prueba de promedio en línea: acumula los números por bloques sin guardarlos
+# y puede evaluarse en cualquier momento con los valores recibidos hasta ese punto
+class OnlineAverageTest(AverageTest):
+    def __init__(self):
+        super().__init__([])
+        self.moments = RunningMoments()  # Acumulador de cantidad y promedio
+
+    # Agrega un bloque de números y actualiza la cantidad
+    def update(self, numbers):
+        self.moments.update(numbers)
+        self.n = self.moments.n
+
+    # Combina con otra prueba en línea (por ejemplo, de otro proceso trabajador)
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.n = self.moments.n
+
+    # Toma el promedio del acumulador en lugar de recorrer los números
+    def compute_average(self):
+        if self.n:
+            self.average = self.moments.mean
+
+    # Evalúa la prueba con los números recibidos hasta ahora. Sin números todavía no hay
+    # promedio ni límites, así que la prueba no se supera.
+    def evaluate_test(self):
+        if self.n < 1:
+            self.average = 0
+            self.upper_limit = 0.0
+            self.lower_limit = 0.0
+            self.passed = False
+            return
+        super().evaluate_test()
 
 if __name__ == "__main__":
     # Solicita al usuario ingresar los números Ri separados por comas
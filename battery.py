@@ -0,0 +1,216 @@
+import numpy as np
+from average_test import AverageTest
+from variance_test import VarianceTest
+from chi2_test import ChiTest
+from ks_test import KsTest
+from poker_test import PokerTest
+from runs_test import RunsTest
+from gap_test import GapTest
+from result_records import test_result
+
+TEST_NAMES = ("average", "variance", "chi2", "ks", "poker", "runs", "gap")  # Pruebas de la batería, en orden
+
+# Retorna la fila de resultados de una prueba evaluada: estadístico, valor crítico o límites y resultado
+def test_record(name, test):
+    return test_result(name, test).record()
+
+class BatteryResult:
+    """
+    Resultado combinado de la batería: guarda un TestResult compacto por cada prueba ejecutada.
+    Con keep_tests=True también conserva la instancia de cada prueba ya evaluada, con su
+    secuencia y sus listas intermedias (None para las pruebas que no se ejecutaron o no se conservan).
+    """
+    __slots__ = ("results", "average_test", "variance_test", "chi_test", "ks_test", "poker_test",
+                 "runs_test", "gap_test", "passed")
+
+    def __init__(self, average_test, variance_test, chi_test, ks_test, poker_test, runs_test=None, gap_test=None,
+                 keep_tests=False):
+        tests = zip(TEST_NAMES, (average_test, variance_test, chi_test, ks_test, poker_test, runs_test, gap_test))
+        self.results = {name: test_result(name, test) for name, test in tests if test is not None}  # Resultados compactos
+        self.average_test = average_test if keep_tests else None    # Prueba de promedio evaluada
+        self.variance_test = variance_test if keep_tests else None  # Prueba de varianza evaluada
+        self.chi_test = chi_test if keep_tests else None            # Prueba de Chi-Cuadrado evaluada
+        self.ks_test = ks_test if keep_tests else None              # Prueba KS evaluada
+        self.poker_test = poker_test if keep_tests else None        # Prueba de poker evaluada
+        self.runs_test = runs_test if keep_tests else None          # Prueba de corridas evaluada
+        self.gap_test = gap_test if keep_tests else None            # Prueba de huecos evaluada
+        self.passed = all(self.summary().values())  # True si todas las pruebas ejecutadas pasaron
+
+    # Retorna un diccionario con cada instancia de prueba conservada, indexado por su nombre
+    def tests(self):
+        tests = zip(TEST_NAMES, (self.average_test, self.variance_test, self.chi_test, self.ks_test, self.poker_test,
+                                 self.runs_test, self.gap_test))
+        return {name: test for name, test in tests if test is not None}
+
+    # Retorna un diccionario con el resultado (superada o no) de cada prueba ejecutada
+    def summary(self):
+        return {name: result.passed for name, result in self.results.items()}
+
+    # Retorna una fila por prueba con su estadístico, valor crítico o límites y su resultado
+    def records(self):
+        return [result.record() for result in self.results.values()]
+
+    # Elimina las referencias a la secuencia (y a sus copias ordenadas o transformadas)
+    # de las instancias conservadas con keep_tests=True, dejando solo sus valores intermedios
+    def drop_sequences(self):
+        tests = self.tests()
+        if "average" in tests:
+            self.average_test.numbers = []
+        if "variance" in tests:
+            self.variance_test.ri_numbers = []
+        if "chi2" in tests:
+            self.chi_test.ri_values = []
+            self.chi_test.ni_values = []
+        if "ks" in tests:
+            self.ks_test.ri = []
+        if "poker" in tests:
+            self.poker_test.ri_nums = []
+        if "runs" in tests:
+            self.runs_test.ri_nums = []
+        if "gap" in tests:
+            self.gap_test.ri_nums = []
+        return self
+
+class Battery:
+    """
+    Ejecuta las pruebas de la batería sobre un único arreglo contiguo.
+    El promedio, la varianza, el mínimo, el máximo y la vista ordenada se calculan una sola vez
+    y se comparten entre las pruebas.
+    """
+    def __init__(self, ri_values, intervals_amount=8, a=8, b=10, ks_intervals=10, alpha=0.05, profiler=None):
+        self.ri = np.ascontiguousarray(ri_values, dtype=np.float64)  # Secuencia cargada una sola vez
+        self.n = self.ri.size                   # Cantidad total de números
+        self.intervals_amount = intervals_amount  # Intervalos de la prueba de Chi-Cuadrado
+        self.a = a                              # Parámetro a de la prueba de Chi-Cuadrado
+        self.b = b                              # Parámetro b de la prueba de Chi-Cuadrado
+        self.ks_intervals = ks_intervals        # Intervalos de la prueba KS
+        self.alpha = alpha                      # Nivel de significancia de todas las pruebas
+        self.average = 0.0                      # Promedio compartido
+        self.variance = 0.0                     # Varianza compartida
+        self.min = 0.0                          # Mínimo compartido
+        self.max = 0.0                          # Máximo compartido
+        self.sorted_ri = None                   # Vista ordenada compartida
+        self.profiler = profiler                # StageProfiler opcional para medir las etapas
+        if profiler is not None:
+            profiler.instrument(self)
+
+    # Instrumenta una prueba con el perfilador de la batería, si hay uno
+    def instrument(self, test):
+        if self.profiler is not None:
+            self.profiler.instrument(test)
+        return test
+
+    # Calcula una sola vez los valores intermedios que comparten las pruebas.
+    # La vista ordenada solo se construye si alguna prueba la necesita.
+    def calculate_shared_values(self, sort=True):
+        if self.n != 0:
+            self.average = float(self.ri.mean())
+            self.variance = float(self.ri.var())
+            if not sort:
+                self.min = float(self.ri.min())
+                self.max = float(self.ri.max())
+                return
+            self.sorted_ri = np.sort(self.ri)
+            self.min = float(self.sorted_ri[0])
+            self.max = float(self.sorted_ri[-1])
+
+    # Prueba de promedio usando el promedio compartido
+    def run_average_test(self):
+        test = self.instrument(AverageTest(self.ri))
+        test.alpha = self.alpha
+        test.average = self.average
+        test.compute_z()
+        test.compute_upper_limit()
+        test.compute_lower_limit()
+        test.passed = test.lower_limit <= test.average <= test.upper_limit
+        return test
+
+    # Prueba de varianza usando el promedio y la varianza compartidos
+    def run_variance_test(self):
+        test = self.instrument(VarianceTest(self.ri))
+        test.alpha = self.alpha
+        test.average = self.average
+        test.variance = self.variance
+        test.calculateChiSquare1()
+        test.calculateChiSquare2()
+        test.calculateSuperiorLimit()
+        test.calculateInferiorLimit()
+        test.passed = test.inferior_limit <= test.variance <= test.superior_limit
+        return test
+
+    # Prueba de Chi-Cuadrado sobre la vista ordenada: la transformación ni es monótona,
+    # así que los ni quedan ordenados y sus extremos salen del primer y último elemento
+    def run_chi_test(self):
+        test = self.instrument(ChiTest(self.ri, self.intervals_amount, self.a, self.b, self.alpha))
+        ni_values = self.a + (self.b - self.a) * self.sorted_ri
+        if self.b < self.a:
+            ni_values = ni_values[::-1]
+        test.checkTestSorted(ni_values)
+        return test
+
+    # Prueba KS usando el mínimo, el máximo, el promedio y la vista ordenada compartidos
+    def run_ks_test(self):
+        test = self.instrument(KsTest(self.sorted_ri, self.ks_intervals))
+        test.alpha = self.alpha
+        test.checkTestSorted(self.average)
+        return test
+
+    # Prueba de poker con el clasificador vectorizado
+    def run_poker_test(self):
+        test = self.instrument(PokerTest(self.ri, self.alpha))
+        test.check_poker_vectorized()
+        return test
+
+    # Prueba de corridas arriba y abajo sobre la secuencia en su orden original
+    def run_runs_test(self):
+        test = self.instrument(RunsTest(self.ri, self.alpha))
+        test.check_runs()
+        return test
+
+    # Prueba de huecos sobre la secuencia en su orden original
+    def run_gap_test(self):
+        test = self.instrument(GapTest(self.ri, alpha=self.alpha))
+        test.check_gap()
+        return test
+
+    # Ejecuta las pruebas indicadas (por defecto todas) y retorna el resultado combinado.
+    # Solo se conservan los resultados compactos; con keep_tests=True también las instancias
+    # de las pruebas, por ejemplo para graficarlas.
+    def run(self, tests=TEST_NAMES, keep_tests=False):
+        unknown = set(tests) - set(TEST_NAMES)
+        if unknown:
+            raise ValueError(f"Pruebas desconocidas: {sorted(unknown)}. Usa algunas de {list(TEST_NAMES)}")
+        if self.n < 2:
+            # Las pruebas de varianza y de corridas necesitan al menos 2 números
+            raise ValueError(f"La secuencia tiene {self.n} números y se necesitan al menos 2")
+        self.calculate_shared_values(sort="chi2" in tests or "ks" in tests)
+        return BatteryResult(*(self.run_test(name) if name in tests else None for name in TEST_NAMES), keep_tests=keep_tests)
+
+    # Ejecuta una sola prueba; los valores compartidos ya deben estar calculados
+    # con calculate_shared_values (con sort=True para Chi-Cuadrado y KS)
+    def run_test(self, name):
+        runners = {
+            "average": self.run_average_test,
+            "variance": self.run_variance_test,
+            "chi2": self.run_chi_test,
+            "ks": self.run_ks_test,
+            "poker": self.run_poker_test,
+            "runs": self.run_runs_test,
+            "gap": self.run_gap_test,
+        }
+        return runners[name]()
+
+if __name__ == "__main__":
+    # Solicita al usuario que ingrese los números Ri separados por comas
+    user_input = input("Ingresa los números Ri separados por comas: ")
+    try:
+        ri_values = [float(x.strip()) for x in user_input.split(",")]
+    except ValueError:
+        print("Error: asegúrate de ingresar únicamente números separados por comas.")
+        exit(1)
+
+    # Ejecuta la batería completa y muestra el resultado de cada prueba
+    result = Battery(ri_values).run()
+    for name, passed in result.summary().items():
+        print(f"¿Prueba {name} superada?:", passed)
+    print("¿Batería superada?:", result.passed)
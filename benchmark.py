@@ -0,0 +1,123 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from average_test import AverageTest
+from variance_test import VarianceTest
+from chi2_test import ChiTest
+from ks_test import KsTest
+from poker_test import PokerTest
+from runs_test import RunsTest
+from gap_test import GapTest
+from serial_test import SerialTest
+from battery import Battery
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+
+# Casos medidos: (nombre, tipo de entrada, función que ejecuta el punto de entrada principal).
+# Las entradas "list" son listas de Python (el uso original); las "array" son arreglos NumPy.
+CASES = [
+    ("AverageTest.evaluate_test", "list", lambda ri: AverageTest(ri).evaluate_test()),
+    ("AverageTest.evaluate_test[array]", "array", lambda ri: AverageTest(ri).evaluate_test()),
+    ("VarianceTest.checkTest", "list", lambda ri: VarianceTest(ri).checkTest()),
+    ("VarianceTest.checkTest[array]", "array", lambda ri: VarianceTest(ri).checkTest()),
+    ("ChiTest.checkTest", "list", lambda ri: ChiTest(ri).checkTest()),
+    ("ChiTest.checkTestVectorized", "array", lambda ri: ChiTest(ri).checkTestVectorized()),
+    ("KsTest.checkTest", "list", lambda ri: KsTest(ri).checkTest()),
+    ("KsTest.checkTest[array]", "array", lambda ri: KsTest(ri).checkTest()),
+    ("KsTest.checkTestExact", "array", lambda ri: KsTest(ri).checkTestExact()),
+    ("PokerTest.check_poker", "list", lambda ri: PokerTest(ri).check_poker()),
+    ("PokerTest.check_poker_vectorized", "array", lambda ri: PokerTest(ri).check_poker_vectorized()),
+    ("RunsTest.check_runs", "array", lambda ri: RunsTest(ri).check_runs()),
+    ("GapTest.check_gap", "array", lambda ri: GapTest(ri).check_gap()),
+    ("SerialTest.check_serial[d=2]", "array", lambda ri: SerialTest(ri, dimension=2).check_serial()),
+    ("SerialTest.check_serial[d=3]", "array", lambda ri: SerialTest(ri, dimension=3).check_serial()),
+    ("Battery.run", "array", lambda ri: Battery(ri).run()),
+]
+
+# Genera la secuencia uniforme de tamaño size con una semilla fija
+def make_sequence(size, seed, kind):
+    values = np.random.default_rng(seed).random(size)
+    return values.tolist() if kind == "list" else values
+
+# Mide el mejor tiempo de repeat ejecuciones y el pico de memoria de una ejecución adicional.
+# Cada ejecución recibe una secuencia nueva porque algunas pruebas ordenan la lista recibida.
+# Una ejecución previa pequeña deja fuera de la medición las importaciones y tablas perezosas.
+def measure(run, size, seed, kind, repeat):
+    run(make_sequence(100, seed, kind))
+    times = []
+    for _ in range(repeat):
+        ri = make_sequence(size, seed, kind)
+        start = time.perf_counter()
+        run(ri)
+        times.append(time.perf_counter() - start)
+        del ri
+    ri = make_sequence(size, seed, kind)
+    tracemalloc.start()
+    run(ri)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak
+
+# Ejecuta todos los casos seleccionados y retorna el reporte comparable en formato JSON
+def run_benchmarks(sizes, seed=0, repeat=3, max_list_size=10 ** 6, cases=None):
+    results = []
+    for name, kind, run in CASES:
+        if cases and not any(name.startswith(case) for case in cases):
+            continue
+        for size in sizes:
+            if kind == "list" and size > max_list_size:
+                continue
+            seconds, peak = measure(run, size, seed, kind, repeat)
+            results.append({"case": name, "input": kind, "size": size, "seconds": seconds, "peak_bytes": peak})
+            print(f"{name:40s} n={size:>11d} {seconds:10.4f} s {peak / 2 ** 20:10.1f} MiB", file=sys.stderr)
+    return {
+        "seed": seed,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+# Compara dos reportes y retorna (caso, tamaño, tiempo base, tiempo actual, aceleración)
+def compare_reports(baseline, current):
+    previous = {(row["case"], row["size"]): row for row in baseline["results"]}
+    rows = []
+    for row in current["results"]:
+        old = previous.get((row["case"], row["size"]))
+        if old is not None:
+            rows.append((row["case"], row["size"], old["seconds"], row["seconds"], old["seconds"] / row["seconds"]))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide tiempo y memoria de cada prueba para distintos tamaños de entrada.")
+    parser.add_argument("--sizes", type=lambda text: [int(float(size)) for size in text.split(",")],
+                        default=DEFAULT_SIZES, help="Tamaños separados por comas (por defecto 1e3 a 1e8)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de las secuencias (por defecto 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición (se toma la mínima)")
+    parser.add_argument("--max-list-size", type=lambda text: int(float(text)), default=10 ** 6,
+                        help="Tamaño máximo para los casos con listas de Python (por defecto 1e6)")
+    parser.add_argument("--cases", help="Prefijos de los casos a medir separados por comas (por defecto todos)")
+    parser.add_argument("--output", help="Archivo donde guardar el reporte JSON (por defecto la salida estándar)")
+    parser.add_argument("--compare", help="Reporte JSON anterior con el que comparar los tiempos")
+    args = parser.parse_args(argv)
+
+    cases = args.cases.split(",") if args.cases else None
+    report = run_benchmarks(args.sizes, args.seed, args.repeat, args.max_list_size, cases)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        for case, size, old, new, speedup in compare_reports(baseline, report):
+            print(f"{case:40s} n={size:>11d} {old:10.4f} s -> {new:10.4f} s  x{speedup:.2f}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
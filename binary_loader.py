@@ -0,0 +1,49 @@
+import os
+import numpy as np
+
+# Tipos binarios soportados (little-endian) para los archivos de números Ri
+BINARY_DTYPES = {
+    "float64": np.dtype("<f8"),
+    "float32": np.dtype("<f4"),
+    "uint32": np.dtype("<u4"),
+}
+
+# Abre un archivo binario de números como un mapa de memoria de solo lectura, sin copiarlo.
+# offset es la cantidad de valores a omitir al inicio y count la cantidad a leer (None: hasta el final).
+def map_binary(path, dtype="float64", offset=0, count=None):
+    if dtype not in BINARY_DTYPES:
+        raise ValueError(f"Tipo binario no soportado: {dtype}. Usa uno de {list(BINARY_DTYPES)}")
+    item = BINARY_DTYPES[dtype]
+    available = os.path.getsize(path) // item.itemsize - offset
+    length = available if count is None else min(count, available)
+    if length <= 0:
+        return np.empty(0, dtype=item)
+    return np.memmap(path, dtype=item, mode="r", offset=offset * item.itemsize, shape=(length,))
+
+# Carga un archivo binario como números Ri en [0, 1).
+# Los archivos float64 y float32 se retornan como vistas del mapa de memoria (sin copia);
+# las palabras uint32 se escalan por 2^-32, lo que sí crea un arreglo float64 nuevo.
+def load_ri(path, dtype="float64", offset=0, count=None):
+    values = map_binary(path, dtype, offset, count)
+    if dtype == "uint32":
+        return values * (1.0 / 2 ** 32)
+    return values
+
+if __name__ == "__main__":
+    from battery import Battery
+
+    # Solicita la ruta del archivo binario y el tipo de sus valores
+    path = input("Ingresa la ruta del archivo binario: ").strip()
+    dtype = input("Ingresa el tipo de los valores (float64, float32, uint32; por defecto float64): ").strip() or "float64"
+    try:
+        ri_values = load_ri(path, dtype)
+    except (OSError, ValueError) as error:
+        print("Error:", error)
+        exit(1)
+
+    # Ejecuta la batería completa sobre el archivo
+    result = Battery(ri_values).run()
+    print("Cantidad de números:", len(ri_values))
+    for name, passed in result.summary().items():
+        print(f"¿Prueba {name} superada?:", passed)
+    print("¿Batería superada?:", result.passed)
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from average_test import AverageTest
+from variance_test import VarianceTest
+from chi2_test import ChiTest
+from ks_test import KsTest
+from poker_test import PokerTest, hand_classes_table, hand_codes
+from runs_test import RunsTest
+from gap_test import GapTest
+from battery import TEST_NAMES
+from critical_values import chi2_ppf, norm_ppf
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)  # Cuantiles de los estadísticos que se reportan
+
+# Cuenta, por fila, los valores de cada intervalo [edges[:, i], edges[:, i + 1]) con límites propios
+# de cada fila. El intervalo se estima con floor((v - inicio) / ancho * k) y se corrige en un paso
+# contra los límites reales (que ChiTest redondea y KsTest acumula); los valores fuera de todos los
+# intervalos no se cuentan, como en los caminos ordenados de ChiTest y KsTest. Una sola bincount
+# cuenta todas las filas desplazando los intervalos de cada fila.
+def row_interval_counts(values, edges):
+    replicates, k = edges.shape[0], edges.shape[1] - 1
+    rows = np.arange(replicates)[:, None]
+    width = edges[:, -1:] - edges[:, :1]
+    width[width == 0] = 1.0
+    bins = np.clip(np.floor((values - edges[:, :1]) / width * k), 0, k - 1).astype(np.int64)
+    bins -= (bins > 0) & (values < edges[rows, bins])
+    bins += (bins < k - 1) & (values >= edges[rows, bins + 1])
+    inside = (values >= edges[rows, bins]) & (values < edges[rows, bins + 1])
+    keys = (bins + rows * k)[inside]
+    return np.bincount(keys, minlength=replicates * k).reshape(replicates, k)
+
+# Calcula los estadísticos de un lote de réplicas: genera una matriz (réplicas x n) de Ri
+# uniformes con su propio flujo de NumPy y evalúa cada prueba sobre todas las filas a la vez,
+# sin crear una instancia por réplica. Chi-Cuadrado y KS reproducen los intervalos de ChiTest y
+# KsTest (entre el mínimo y el máximo de cada fila) y cuentan todas las filas con row_interval_counts.
+# Recibe una sola tupla para usarse con executor.map en Calibration.run.
+def run_calibration_batch(task):
+    seed, replicates, n, intervals_amount, ks_intervals, a, b, alpha, tests = task
+    samples = np.random.default_rng(seed).random((replicates, n))
+    statistics = {}
+    if "average" in tests:
+        statistics["average"] = samples.mean(axis=1)
+    if "variance" in tests:
+        statistics["variance"] = samples.var(axis=1)
+    if "chi2" in tests:
+        ni_values = a + (b - a) * samples
+        low, high = ni_values.min(axis=1), ni_values.max(axis=1)
+        # Límites de ChiTest.buildIntervals: cada uno es el anterior más el ancho, redondeado a 5 decimales
+        edges = np.empty((replicates, intervals_amount + 1))
+        edges[:, 0] = low
+        for i in range(intervals_amount):
+            edges[:, i + 1] = np.round(edges[:, i] + (high - low) / intervals_amount, 5)
+        counts = row_interval_counts(ni_values, edges)
+        expected = round(float(n) / intervals_amount, 2)
+        statistics["chi2"] = np.round((counts - expected) ** 2 / expected, 2).sum(axis=1)
+    if "ks" in tests:
+        low, high = samples.min(axis=1), samples.max(axis=1)
+        # Límites de KsTest.build_intervals: cada uno es el anterior más el ancho, sin redondear
+        edges = np.empty((replicates, ks_intervals + 1))
+        edges[:, 0] = low
+        for i in range(ks_intervals):
+            edges[:, i + 1] = edges[:, i] + (high - low) / ks_intervals
+        # Función de distribución empírica de cada fila en los límites superiores de los intervalos
+        observed = np.cumsum(row_interval_counts(samples, edges), axis=1) / n
+        expected = n / ks_intervals * np.arange(1, ks_intervals + 1) / n
+        statistics["ks"] = np.abs(expected - observed).max(axis=1)
+    if "poker" in tests:
+        poker = PokerTest([], alpha)
+        classes = hand_classes_table(poker.hand_digits)[hand_codes(samples, poker.hand_digits)]
+        categories = len(poker.prob)
+        # Una sola bincount para todas las filas, desplazando las clases de cada fila
+        classes = classes + np.arange(replicates)[:, None] * categories
+        counts = np.bincount(classes.ravel(), minlength=replicates * categories).reshape(replicates, categories)
+        expected = np.asarray(poker.prob) * n
+        statistics["poker"] = ((counts - expected) ** 2 / expected).sum(axis=1)
+    if "runs" in tests:
+        runs = RunsTest([], alpha)
+        runs.n = n
+        runs.calculate_expected()
+        ups = samples[:, 1:] > samples[:, :-1]
+        observed = 1 + np.count_nonzero(ups[:, 1:] != ups[:, :-1], axis=1)
+        statistics["runs"] = (observed - runs.expected_runs) / np.sqrt(runs.variance_runs)
+    if "gap" in tests:
+        gap = GapTest([], alpha=alpha)
+        rows, columns = np.nonzero((samples >= gap.low) & (samples <= gap.high))
+        # Solo cuentan los huecos entre apariciones consecutivas de la misma fila
+        same_row = rows[1:] == rows[:-1]
+        gaps = np.minimum(columns[1:][same_row] - columns[:-1][same_row] - 1, gap.max_gap)
+        classes = gap.max_gap + 1
+        counts = np.bincount(rows[1:][same_row] * classes + gaps,
+                             minlength=replicates * classes).reshape(replicates, classes)
+        gap.calculate_ei()
+        expected = counts.sum(axis=1, keepdims=True) * np.asarray(gap.prob)
+        # Una fila sin huecos no tiene frecuencias esperadas; queda como NaN y summarize la omite
+        with np.errstate(divide="ignore", invalid="ignore"):
+            statistics["gap"] = np.where(expected[:, 0] > 0, ((counts - expected) ** 2 / expected).sum(axis=1), np.nan)
+    return statistics
+
+# Retorna los límites o el valor crítico de cada prueba para muestras de tamaño n, tomados
+# de las mismas clases de prueba, y el cuantil teórico q de su estadístico bajo la hipótesis nula
+def theoretical_limits(name, n, intervals_amount, alpha):
+    if name == "average":
+        test = AverageTest([])
+        test.n = n
+        test.alpha = alpha
+        test.compute_z()
+        test.compute_upper_limit()
+        test.compute_lower_limit()
+        return {"lower": test.lower_limit, "upper": test.upper_limit,
+                "quantile": lambda q: 0.5 + norm_ppf(q) / np.sqrt(12 * n)}
+    if name == "variance":
+        test = VarianceTest([])
+        test.n = n
+        test.alpha = alpha
+        test.calculateChiSquare1()
+        test.calculateChiSquare2()
+        test.calculateInferiorLimit()
+        test.calculateSuperiorLimit()
+        return {"lower": test.inferior_limit, "upper": test.superior_limit,
+                "quantile": lambda q: chi2_ppf(q, n - 1) / (12 * (n - 1))}
+    if name == "chi2":
+        test = ChiTest([], intervals_amount)
+        test.alpha = alpha
+        return {"critical": test.chi_squared_test_value(),
+                "quantile": lambda q: chi2_ppf(q, intervals_amount - 1)}
+    if name == "ks":
+        def ks_critical(q):
+            test = KsTest([])
+            test.n = n
+            test.alpha = q
+            test.calculate_KS()
+            return test.d_max_p
+        return {"critical": ks_critical(alpha), "quantile": lambda q: ks_critical(1 - q)}
+    if name == "poker":
+        test = PokerTest([], alpha)
+        return {"critical": test.chi_reverse, "quantile": lambda q: chi2_ppf(q, len(test.prob) - 1)}
+    if name == "runs":
+        z_critical = norm_ppf(1 - alpha / 2)
+        return {"lower": -z_critical, "upper": z_critical, "quantile": norm_ppf}
+    if name == "gap":
+        test = GapTest([], alpha=alpha)
+        return {"critical": chi2_ppf(1 - alpha, test.max_gap), "quantile": lambda q: chi2_ppf(q, test.max_gap)}
+    raise ValueError(f"Prueba desconocida: {name}")
+
+# Resume los estadísticos de una prueba: tasa de rechazo empírica (error tipo I, ya que las
+# secuencias son uniformes) frente a alpha, y cuantiles empíricos frente a los teóricos.
+# Los criterios de rechazo son los mismos de cada prueba (poker rechaza con >=, las demás con >).
+# Las réplicas sin estadístico (NaN, p. ej. huecos sin apariciones) se omiten y se cuentan aparte.
+def summarize(name, values, n, intervals_amount, alpha):
+    limits = theoretical_limits(name, n, intervals_amount, alpha)
+    skipped = int(np.count_nonzero(np.isnan(values)))
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        raise ValueError(f"Ninguna réplica de {name} produjo un estadístico")
+    if "critical" in limits:
+        critical = limits["critical"]
+        rejected = values >= critical if name == "poker" else values > critical
+    else:
+        rejected = (values < limits["lower"]) | (values > limits["upper"])
+    rejections = int(np.count_nonzero(rejected))
+    # Error estándar binomial de la tasa de rechazo si la prueba estuviera bien calibrada
+    standard_error = float(np.sqrt(alpha * (1 - alpha) / values.size))
+    row = {
+        "test": name,
+        "replicates": int(values.size),
+        "skipped": skipped,
+        "rejections": rejections,
+        "type_i_error": rejections / values.size,
+        "alpha": alpha,
+        "z_score": (rejections / values.size - alpha) / standard_error,
+        "critical": limits.get("critical"),
+        "lower": limits.get("lower"),
+        "upper": limits.get("upper"),
+        "mean": float(values.mean()),
+        "quantiles": {},
+    }
+    for q, empirical in zip(QUANTILES, np.quantile(values, QUANTILES)):
+        row["quantiles"][str(q)] = {"empirical": float(empirical), "theoretical": float(limits["quantile"](q))}
+    for key in ("critical", "lower", "upper"):
+        if row[key] is not None:
+            row[key] = float(row[key])
+    return row
+
+class Calibration:
+    """
+    Calibración Monte Carlo de las pruebas: ejecuta muchas réplicas de cada prueba sobre
+    secuencias uniformes generadas con flujos de NumPy con semilla, por lotes y en paralelo,
+    y reporta la tasa de rechazo empírica (error tipo I) y la distribución de los estadísticos
+    frente a los valores teóricos de critical_values.
+    Cada lote tiene su propia semilla derivada de seed con SeedSequence.spawn, así que el
+    resultado es el mismo sin importar la cantidad de procesos.
+    """
+    def __init__(self, n=1000, replicates=10000, batch_size=500, intervals_amount=8, ks_intervals=10,
+                 a=8, b=10, alpha=0.05, seed=None, workers=None):
+        self.n = n                              # Cantidad de números por réplica
+        self.replicates = replicates            # Cantidad de réplicas de cada prueba
+        self.batch_size = batch_size            # Réplicas por lote (filas de cada matriz generada)
+        self.intervals_amount = intervals_amount  # Intervalos de la prueba de Chi-Cuadrado
+        self.ks_intervals = ks_intervals        # Intervalos de la prueba KS
+        self.a = a                              # Límite inferior de la transformación de Chi-Cuadrado
+        self.b = b                              # Límite superior de la transformación de Chi-Cuadrado
+        self.alpha = alpha                      # Nivel de significancia a calibrar
+        self.seed = seed                        # Semilla raíz (None: entropía del sistema)
+        self.workers = workers                  # Procesos del grupo (1: en el proceso actual)
+        self.statistics = {}                    # Estadísticos de todas las réplicas por prueba
+        self.results = []                       # Resumen por prueba
+
+    # Divide las réplicas en lotes, cada uno con su semilla independiente
+    def tasks(self, tests):
+        children = np.random.SeedSequence(self.seed).spawn(-(-self.replicates // self.batch_size))
+        for i, child in enumerate(children):
+            size = min(self.batch_size, self.replicates - i * self.batch_size)
+            yield (child, size, self.n, self.intervals_amount, self.ks_intervals,
+                   self.a, self.b, self.alpha, tuple(tests))
+
+    # Ejecuta los lotes (en un grupo de procesos si workers != 1) y junta los estadísticos
+    def run(self, tests=TEST_NAMES):
+        unknown = set(tests) - set(TEST_NAMES)
+        if unknown:
+            raise ValueError(f"Pruebas desconocidas: {sorted(unknown)}")
+        if not tests or self.n < 2 or self.replicates < 1:
+            raise ValueError("Se necesita al menos una prueba, una réplica y 2 números por réplica")
+        tasks = list(self.tasks(tests))
+        if self.workers == 1:
+            batches = [run_calibration_batch(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers or os.cpu_count() or 1) as executor:
+                batches = list(executor.map(run_calibration_batch, tasks))
+        self.statistics = {name: np.concatenate([batch[name] for batch in batches])
+                           for name in TEST_NAMES if name in tests}
+        self.results = [summarize(name, values, self.n, self.intervals_amount, self.alpha)
+                        for name, values in self.statistics.items()]
+        return self.results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibración Monte Carlo del error tipo I de las pruebas.")
+    parser.add_argument("-n", type=int, default=1000, help="Números por réplica (por defecto 1000)")
+    parser.add_argument("--replicates", type=int, default=10000, help="Réplicas por prueba (por defecto 10000)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Réplicas por lote (por defecto 500)")
+    parser.add_argument("--tests", default=",".join(TEST_NAMES), help="Pruebas separadas por comas")
+    parser.add_argument("--intervals", type=int, default=8, help="Intervalos de Chi-Cuadrado (por defecto 8)")
+    parser.add_argument("--ks-intervals", type=int, default=10, help="Intervalos de KS (por defecto 10)")
+    parser.add_argument("-a", type=float, default=8, help="Límite inferior de Chi-Cuadrado (por defecto 8)")
+    parser.add_argument("-b", type=float, default=10, help="Límite superior de Chi-Cuadrado (por defecto 10)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Nivel de significancia (por defecto 0.05)")
+    parser.add_argument("--seed", type=int, help="Semilla raíz para reproducir la calibración")
+    parser.add_argument("--workers", type=int, help="Procesos (por defecto todos los núcleos; 1 sin grupo)")
+    args = parser.parse_args(argv)
+
+    tests = [name for name in args.tests.split(",") if name]
+    try:
+        calibration = Calibration(args.n, args.replicates, args.batch_size, args.intervals, args.ks_intervals,
+                                  args.a, args.b, args.alpha, args.seed, args.workers)
+        results = calibration.run(tests)
+    except ValueError as error:
+        parser.error(str(error))
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,34 @@
 from typing import Any
-from scipy.stats import chi2
+import os
+import tempfile
+from critical_values import chi2_ppf
+from integer_input import scaled_counts
+from out_of_core import iter_chunks, spill_chunks
 import numpy as np
-import matplotlib.pyplot as plt
+from plotting import pyplot, show_or_save
+
+# Compara frecuencias observadas con esperadas por clase: retorna los valores (oi - ei)^2 / ei de
+# cada clase, su sumatoria y el valor crítico de Chi-Cuadrado con (clases - 1) grados de libertad.
+# La usan las pruebas que agrupan los números en clases propias, como la de huecos.
+def chi_square_comparison(observed, expected, alpha=0.05):
+    observed = np.asarray(observed, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    values = ((observed - expected) ** 2) / expected
+    return values, float(values.sum()), chi2_ppf(1 - alpha, observed.size - 1)
+
+# Sumatoria de Chi-Cuadrado con frecuencia esperada uniforme total / cells cuando solo se conocen
+# los conteos de las celdas ocupadas: cada celda vacía aporta (0 - e)^2 / e = e.
+# counts puede incluir ceros (histograma denso) o solo las celdas ocupadas (histograma disperso).
+def uniform_chi_square(counts, cells, total):
+    expected = total / cells
+    counts = np.asarray(counts, dtype=np.float64)
+    return float(np.sum((counts - expected) ** 2) / expected + (cells - counts.size) * expected)
 
 class ChiTest:
     """
     Clase que implementa la Prueba de Chi-Cuadrado para una secuencia de números generados.
     """
-    def __init__(self, ri_values=[], intervals_amount=8, a=8, b=10):
+    def __init__(self, ri_values=[], intervals_amount=8, a=8, b=10, alpha=0.05):
         self.ri_values = ri_values          # Lista de números Ri ingresados
         self.ni_values = []                 # Lista de valores ni calculados
         self.a = a                          # Parámetro a para el cálculo de ni
@@ -23,6 +44,7 @@ class ChiTest:
         self.chiReverse = 0                 # Valor crítico de la prueba de Chi-Cuadrado
         self.sumChi2 = 0                    # Sumatoria de los valores de Chi-Cuadrado
         self.passed = False                 # Resultado de la prueba (superada o no)
+        self.alpha = alpha                  # Nivel de significancia de la prueba
 
     # Calcula y llena la lista 'ni_values' a partir de los números Ri
     def fillNiValues(self):
@@ -48,6 +70,10 @@ class ChiTest:
     def fillIntervalsValuesArray(self):
         min_value = self.obtainMinNiValue()
         max_value = self.obtainMaxNiValue()
+        self.buildIntervals(min_value, max_value)
+
+    # Construye los límites de los intervalos entre min_value y max_value
+    def buildIntervals(self, min_value, max_value):
         self.intervals_values.append(min_value)
         for i in range(self.intervals_amount):
             value = round(self.intervals_values[i] + (max_value - min_value) / self.intervals_amount, 5)
@@ -76,10 +102,9 @@ class ChiTest:
 
     # Calcula el valor crítico de Chi-Cuadrado para la prueba
     def chi_squared_test_value(self):
-        margin_of_error = 0.05
+        margin_of_error = self.alpha
         degrees_of_freedom = self.intervals_amount - 1
-        chiSquared = chi2(degrees_of_freedom)
-        return chiSquared.ppf(1.0 - margin_of_error)
+        return chi2_ppf(1.0 - margin_of_error, degrees_of_freedom)
 
     # Realiza la prueba de Chi-Cuadrado
     def checkTest(self):
@@ -92,8 +117,88 @@ class ChiTest:
         self.sumChi2 = self.cumulativeChiSquaredValues()
         self.passed = self.sumChi2 <= self.chi_squared_test_value()
 
+    # Realiza la prueba de Chi-Cuadrado sobre un arreglo NumPy en una sola pasada vectorizada.
+    # Produce las mismas frecuencias y la misma sumatoria que checkTest sin ordenar los datos.
+    def checkTestVectorized(self):
+        ri = np.asarray(self.ri_values, dtype=np.float64)
+        self.ni_values = self.a + (self.b - self.a) * ri
+        self.niMin = float(self.ni_values.min())
+        self.niMax = float(self.ni_values.max())
+        self.buildIntervals(self.niMin, self.niMax)
+        self.fillFrequenciesArraysVectorized()
+        self.fillChiSquaredValuesArrayVectorized()
+        self.chiReverse = self.chi_squared_test_value()
+        self.sumChi2 = self.cumulativeChiSquaredValues()
+        self.passed = self.sumChi2 <= self.chiReverse
+
+    # Realiza la prueba a partir de los valores ni ya calculados y ordenados de forma ascendente
+    def checkTestSorted(self, sorted_ni_values):
+        self.ni_values = sorted_ni_values
+        self.niMin = float(sorted_ni_values[0])
+        self.niMax = float(sorted_ni_values[-1])
+        self.buildIntervals(self.niMin, self.niMax)
+        self.fillFrequenciesArraysSorted()
+        self.fillChiSquaredValuesArrayVectorized()
+        self.chiReverse = self.chi_squared_test_value()
+        self.sumChi2 = self.cumulativeChiSquaredValues()
+        self.passed = self.sumChi2 <= self.chiReverse
+
+    # Cuenta las frecuencias observadas con searchsorted y bincount sobre los intervalos [li, ls)
+    def fillFrequenciesArraysVectorized(self):
+        self.setFrequencies(self.countFrequencies(self.ni_values))
+
+    # Retorna cuántos valores de ni_values caen en cada intervalo [li, ls)
+    def countFrequencies(self, ni_values):
+        edges = np.asarray(self.intervals_values, dtype=np.float64)
+        if np.all(np.diff(edges) >= 0):
+            indexes = np.searchsorted(edges, ni_values, side='right') - 1
+            indexes = indexes[(indexes >= 0) & (indexes < self.intervals_amount)]
+            return np.bincount(indexes, minlength=self.intervals_amount)
+        # El redondeo a 5 decimales puede dejar límites decrecientes cuando el rango es muy pequeño
+        return np.array([np.count_nonzero((ni_values >= edges[i]) & (ni_values < edges[i + 1]))
+                         for i in range(self.intervals_amount)], dtype=np.int64)
+
+    # Cuenta las frecuencias observadas cuando ni_values ya es un arreglo ordenado de forma ascendente.
+    # Solo hace una búsqueda binaria por límite de intervalo.
+    def fillFrequenciesArraysSorted(self):
+        edges = np.asarray(self.intervals_values, dtype=np.float64)
+        positions = np.searchsorted(self.ni_values, edges, side='left')
+        counts = np.maximum(np.diff(positions), 0)
+        self.setFrequencies(counts)
+
+    # Guarda las frecuencias observadas y las esperadas a partir de los conteos por intervalo
+    def setFrequencies(self, counts):
+        expected_freq = round(float(self.num_amount) / self.intervals_amount, 2)
+        self.frequency_obtained = counts.tolist()
+        self.expected_frequency = [expected_freq] * self.intervals_amount
+
+    # Realiza la prueba directamente sobre palabras enteras sin signo (uint8 a uint64), sin
+    # convertirlas a float: la palabra w cae en el intervalo floor(w * k / 2^bits), así que los
+    # intervalos son k partes iguales de [a, b) y no dependen del mínimo y máximo observados.
+    def checkTestIntegers(self):
+        words = np.asarray(self.ri_values)
+        self.num_amount = words.size
+        self.niMin = self.a
+        self.niMax = self.b
+        self.intervals_values = [round(self.a + (self.b - self.a) * i / self.intervals_amount, 5)
+                                 for i in range(self.intervals_amount + 1)]
+        self.setFrequencies(scaled_counts(words, self.intervals_amount, self.intervals_amount))
+        self.fillChiSquaredValuesArrayVectorized()
+        self.chiReverse = self.chi_squared_test_value()
+        self.sumChi2 = self.cumulativeChiSquaredValues()
+        self.passed = self.sumChi2 <= self.chiReverse
+
+    # Calcula los valores de Chi-Cuadrado de todos los intervalos a la vez
+    def fillChiSquaredValuesArrayVectorized(self):
+        observed = np.asarray(self.frequency_obtained, dtype=np.float64)
+        expected = np.asarray(self.expected_frequency, dtype=np.float64)
+        values = ((observed - expected) ** 2) / expected
+        # Se redondea con round() de Python para conservar los mismos valores que fillChiSquaredValuesArray
+        self.chi_squared_values = [round(value, 2) for value in values.tolist()]
+
     # Genera un gráfico de barras para comparar la sumatoria de Chi2 y el valor crítico
-    def plotChi2(self):
+    def plotChi2(self, path=None):
+        plt = pyplot(headless=path is not None)
         labels = ["Sumatoria de Chi2", "Valor Crítico Chi2"]
         values = [self.cumulativeChiSquaredValues(), self.chi_squared_test_value()]
         fig, ax = plt.subplots()
@@ -104,10 +209,11 @@ class ChiTest:
         for bar, value in zip(bars, values):
             ax.annotate(str(value), xy=(bar.get_x() + bar.get_width() / 2, value),
                         xytext=(0, 1), textcoords='offset points', ha='center', va='bottom')
-        plt.show()
+        show_or_save(plt, path)
 
     # Genera un gráfico de barras que muestra las frecuencias observadas y esperadas por intervalo
-    def plotFrequencies(self):
+    def plotFrequencies(self, path=None):
+        plt = pyplot(headless=path is not None)
         x = np.arange(len(self.intervals_values) - 1)
         width = 0.35
         fig, ax = plt.subplots()
@@ -121,7 +227,73 @@ class ChiTest:
         ax.set_xticklabels(interval_labels, rotation=45, ha='right')
         ax.legend()
         plt.tight_layout()
-        plt.show()
+        show_or_save(plt, path)
+
+class StreamingChiTest(ChiTest):
+    """
+    Prueba de Chi-Cuadrado por bloques para secuencias más grandes que la memoria. No ordena:
+    una primera pasada obtiene la cantidad y los extremos de ni y una segunda cuenta las
+    frecuencias, con los mismos resultados que checkTest. Si la fuente solo se puede recorrer
+    una vez, en la primera pasada se copia a un archivo temporal que se lee como mapa de memoria.
+    """
+    def __init__(self, chunks, intervals_amount=8, a=8, b=10, alpha=0.05, chunk_size=65536, directory=None):
+        super().__init__([], intervals_amount, a, b, alpha)
+        self.chunks = chunks            # Iterable de bloques (listas o arreglos) o de números sueltos
+        self.chunk_size = chunk_size    # Tamaño de bloque al recorrer la fuente
+        self.directory = directory      # Directorio del archivo temporal (None: el del sistema)
+
+    # Recorre la fuente y calcula la cantidad y los extremos de ni
+    def calculateBounds(self, chunks):
+        for chunk in chunks:
+            if chunk.size == 0:
+                continue
+            ni_values = self.a + (self.b - self.a) * chunk
+            chunk_min = float(ni_values.min())
+            chunk_max = float(ni_values.max())
+            self.niMin = chunk_min if self.num_amount == 0 else min(self.niMin, chunk_min)
+            self.niMax = chunk_max if self.num_amount == 0 else max(self.niMax, chunk_max)
+            self.num_amount += chunk.size
+
+    def checkTest(self):
+        with tempfile.TemporaryDirectory(dir=self.directory) as directory:
+            source = self.chunks
+            if iter(source) is source:
+                source = spill_chunks(self.recordBounds(iter_chunks(source, self.chunk_size)),
+                                      os.path.join(directory, "ri.f64"))
+            else:
+                self.calculateBounds(iter_chunks(source, self.chunk_size))
+            if self.num_amount == 0:
+                raise ValueError("La secuencia de números está vacía")
+            self.buildIntervals(self.niMin, self.niMax)
+            counts = np.zeros(self.intervals_amount, dtype=np.int64)
+            for chunk in iter_chunks(source, self.chunk_size):
+                counts += self.countFrequencies(self.a + (self.b - self.a) * chunk)
+            del source
+        self.setFrequencies(counts)
+        self.fillChiSquaredValuesArrayVectorized()
+        self.chiReverse = self.chi_squared_test_value()
+        self.sumChi2 = self.cumulativeChiSquaredValues()
+        self.passed = self.sumChi2 <= self.chiReverse
+
+    # Entrega los mismos bloques mientras actualiza la cantidad y los extremos de ni
+    def recordBounds(self, chunks):
+        for chunk in chunks:
+            self.calculateBounds([chunk])
+            yield chunk
+
+# Ejecuta la prueba de Chi-Cuadrado con varias cantidades de intervalos a partir de una sola
+# transformación y un solo ordenamiento de los datos. Cada resolución solo cuesta una búsqueda
+# binaria por límite de intervalo y da los mismos resultados que ChiTest.checkTest.
+# Retorna un diccionario {cantidad de intervalos: ChiTest evaluado}.
+def check_resolutions(ri_values, intervals_amounts, a=8, b=10, alpha=0.05):
+    ri = np.asarray(ri_values, dtype=np.float64)
+    sorted_ni_values = np.sort(a + (b - a) * ri)
+    tests = {}
+    for intervals_amount in intervals_amounts:
+        test = ChiTest(ri_values, intervals_amount, a, b, alpha)
+        test.checkTestSorted(sorted_ni_values)
+        tests[intervals_amount] = test
+    return tests
 
 if __name__ == "__main__":
     # Solicita al usuario que ingrese los números Ri separados por comas
@@ -0,0 +1,139 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import numpy as np
+from battery import Battery, TEST_NAMES
+from binary_loader import BINARY_DTYPES, load_ri
+from parallel_battery import load_sequence
+from result_cache import ResultCache, cached_records
+
+CSV_FIELDS = ["source", "test", "n", "passed", "statistic", "critical", "lower", "upper"]
+
+# Valida un argumento entero positivo (cantidad de intervalos)
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} no es un número entero")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"debe ser positivo, se recibió {value}")
+    return value
+
+# Valida un nivel de significancia estrictamente entre 0 y 1
+def probability(text):
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} no es un número")
+    if not 0 < value < 1:
+        raise argparse.ArgumentTypeError(f"debe estar entre 0 y 1, se recibió {value}")
+    return value
+
+# Convierte la lista de pruebas separadas por comas y valida que no esté vacía ni tenga nombres desconocidos
+def test_names(text):
+    tests = tuple(name.strip() for name in text.split(",") if name.strip())
+    if not tests:
+        raise argparse.ArgumentTypeError("no se indicó ninguna prueba")
+    unknown = sorted(set(tests) - set(TEST_NAMES))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"pruebas desconocidas: {', '.join(unknown)}")
+    return tests
+
+# Construye el analizador de argumentos de la línea de comandos
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Ejecuta las pruebas de números pseudoaleatorios sin interacción y entrega los resultados en JSON o CSV.")
+    parser.add_argument("paths", nargs="*", default=["-"],
+                        help="Archivos con los números Ri ('-' o ninguno para leer de la entrada estándar)")
+    parser.add_argument("--input-format", choices=["text"] + list(BINARY_DTYPES), default="text",
+                        help="Formato de la entrada: texto separado por comas/espacios o binario (por defecto text)")
+    parser.add_argument("--tests", type=test_names, default=",".join(TEST_NAMES),
+                        help="Pruebas a ejecutar separadas por comas (por defecto todas: %(default)s)")
+    parser.add_argument("--intervals", type=positive_int, default=8, help="Intervalos de la prueba de Chi-Cuadrado (por defecto 8)")
+    parser.add_argument("--ks-intervals", type=positive_int, default=10, help="Intervalos de la prueba KS (por defecto 10)")
+    parser.add_argument("-a", type=float, default=8, help="Parámetro a de la prueba de Chi-Cuadrado (por defecto 8)")
+    parser.add_argument("-b", type=float, default=10, help="Parámetro b de la prueba de Chi-Cuadrado (por defecto 10)")
+    parser.add_argument("--alpha", type=probability, default=0.05, help="Nivel de significancia (por defecto 0.05)")
+    parser.add_argument("--output", choices=["json", "csv"], default="json",
+                        help="Formato de salida: una línea JSON por prueba o CSV (por defecto json)")
+    parser.add_argument("--plot", action="store_true", help="Muestra los gráficos de cada prueba (usa matplotlib)")
+    parser.add_argument("--plot-dir", help="Guarda los gráficos de cada prueba como PNG en este directorio, sin mostrarlos")
+    parser.add_argument("--cache-dir", help="Directorio de la caché de resultados por contenido (por defecto sin caché)")
+    parser.add_argument("--cache-size", type=float, default=64, help="Tamaño máximo de la caché en MiB (por defecto 64)")
+    return parser
+
+# Lee los números Ri de un archivo o de la entrada estándar ('-')
+def read_sequence(path, input_format):
+    if path == "-":
+        if input_format == "text":
+            return np.array(sys.stdin.read().replace(",", " ").split(), dtype=np.float64)
+        values = np.frombuffer(sys.stdin.buffer.read(), dtype=BINARY_DTYPES[input_format])
+        return values * (1.0 / 2 ** 32) if input_format == "uint32" else values
+    if input_format == "text":
+        return load_sequence(path)
+    return load_ri(path, input_format)
+
+# Muestra los gráficos de las pruebas ejecutadas o, si se indica un directorio,
+# los guarda como <fuente>_<prueba>.png con un backend no interactivo
+def plot_result(result, source, directory=None):
+    tests = result.tests()
+    plots = {
+        "average": "plot_graph",
+        "variance": "plotLimitsAndVariance",
+        "chi2": "plotChi2",
+        "ks": "plotDs",
+        "poker": "plot_totalSum_vs_chiReverse",
+        "runs": "plot_z",
+        "gap": "plot_oi_vs_ei",
+    }
+    stem = "stdin" if source == "-" else os.path.splitext(os.path.basename(source))[0]
+    for name, test in tests.items():
+        path = None if directory is None else os.path.join(directory, f"{stem}_{name}.png")
+        getattr(test, plots[name])(path)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    tests = args.tests
+    writer = None
+    if args.output == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+    plot = args.plot or args.plot_dir
+    if args.plot_dir:
+        try:
+            os.makedirs(args.plot_dir, exist_ok=True)
+        except OSError as error:
+            print(f"Error en --plot-dir: {error}", file=sys.stderr)
+            return 2
+    # Los gráficos necesitan las pruebas evaluadas, así que al graficar no se usa la caché
+    cache = ResultCache(args.cache_dir, int(args.cache_size * 2 ** 20)) if args.cache_dir and not plot else None
+    status = 0
+    for path in args.paths:
+        try:
+            ri_values = read_sequence(path, args.input_format)
+            if cache is not None:
+                records = cached_records(ri_values, cache, tests, args.intervals, args.a, args.b,
+                                         args.ks_intervals, args.alpha)
+            else:
+                result = Battery(ri_values, args.intervals, args.a, args.b, args.ks_intervals, args.alpha).run(tests, keep_tests=bool(plot))
+                records = result.records()
+                if plot:
+                    plot_result(result, path, args.plot_dir)
+        except (OSError, ValueError) as error:
+            print(f"Error en {path}: {error}", file=sys.stderr)
+            status = 2
+            continue
+        for record in records:
+            record = {"source": path, **record}
+            if writer is not None:
+                writer.writerow(record)
+            else:
+                print(json.dumps(record))
+        if not all(record["passed"] for record in records) and status == 0:
+            status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import numpy as np
+from critical_values import chi2_ppf, ksone_ppf, kstwobign_isf
+
+# Compara varios generadores a la vez. samples es un arreglo 2-D (generadores x muestras) de
+# números Ri en [0, 1), todos con la misma cantidad de muestras, así que los valores críticos,
+# los límites de los intervalos y las frecuencias esperadas se calculan una sola vez y cada
+# prueba se evalúa sobre todas las filas con operaciones vectorizadas:
+# - Varianza: la misma de VarianceTest (numpy.var por fila).
+# - Chi-Cuadrado: intervalos fijos de igual tamaño en [0, 1), compartidos por todas las filas
+#   (como en WindowedTests), en lugar de los extremos observados de cada fila.
+# - KS: el estadístico exacto D = max(D+, D-) de KsTest.checkTestExact.
+# Retorna una fila por generador, ordenadas de mejor a peor: primero por cantidad de pruebas
+# fallidas y luego por la mayor razón entre el estadístico y su valor crítico.
+def compare_generators(samples, names=None, intervals_amount=8, alpha=0.05):
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.ndim != 2 or samples.shape[1] < 2:
+        raise ValueError("Se esperaba un arreglo 2-D (generadores x muestras) con al menos 2 muestras")
+    generators, n = samples.shape
+    names = list(range(generators)) if names is None else list(names)
+    if len(names) != generators:
+        raise ValueError(f"Se recibieron {len(names)} nombres para {generators} generadores")
+
+    # Varianza con límites compartidos
+    variances = samples.var(axis=1)
+    inferior_limit = chi2_ppf(alpha / 2, n - 1) / (12 * (n - 1))
+    superior_limit = chi2_ppf(1 - alpha / 2, n - 1) / (12 * (n - 1))
+    variance_ratio = np.abs(variances - (inferior_limit + superior_limit) / 2) / ((superior_limit - inferior_limit) / 2)
+
+    # Chi-Cuadrado con intervalos y frecuencia esperada compartidos: una sola bincount para todas las filas
+    bins = np.clip((samples * intervals_amount).astype(np.int64), 0, intervals_amount - 1)
+    bins += np.arange(generators)[:, None] * intervals_amount
+    counts = np.bincount(bins.ravel(), minlength=generators * intervals_amount).reshape(generators, intervals_amount)
+    expected = n / intervals_amount
+    chi2_values = ((counts - expected) ** 2 / expected).sum(axis=1)
+    chi2_critical = chi2_ppf(1 - alpha, intervals_amount - 1)
+
+    # KS exacta con las posiciones i/n compartidas y un solo ordenamiento por filas
+    cdf = np.clip(np.sort(samples, axis=1), 0.0, 1.0)
+    positions = np.arange(1, n + 1) / n
+    d_plus = (positions - cdf).max(axis=1)
+    d_minus = (cdf - (positions - 1.0 / n)).max(axis=1)
+    d_max = np.maximum(d_plus, d_minus)
+    ks_critical = ksone_ppf(1 - alpha / 2, n) if n <= 50 else kstwobign_isf(alpha) / np.sqrt(n)
+
+    rows = []
+    for i in range(generators):
+        row = {
+            "generator": names[i],
+            "variance": float(variances[i]),
+            "variance_passed": bool(inferior_limit <= variances[i] <= superior_limit),
+            "chi2": float(chi2_values[i]),
+            "chi2_passed": bool(chi2_values[i] <= chi2_critical),
+            "ks": float(d_max[i]),
+            "ks_passed": bool(d_max[i] <= ks_critical),
+            "score": float(max(variance_ratio[i], chi2_values[i] / chi2_critical, d_max[i] / ks_critical)),
+        }
+        row["failed"] = 3 - row["variance_passed"] - row["chi2_passed"] - row["ks_passed"]
+        rows.append(row)
+    rows.sort(key=lambda row: (row["failed"], row["score"]))
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+CACHE_SIZE = 1024   # Cantidad máxima de valores críticos guardados (se descartan los menos usados)
+
+# Calcula y guarda el valor de method (ppf, isf...) de una distribución de scipy.stats.
+# La llave es (distribución, método, probabilidad, parámetros) y la caché se comparte
+# entre todas las instancias de las pruebas.
+@lru_cache(maxsize=CACHE_SIZE)
+def critical_value(distribution, method, probability, *params):
+    # scipy.stats se importa aquí para no cargarlo al importar las pruebas
+    from scipy import stats
+    return float(getattr(getattr(stats, distribution), method)(probability, *params))
+
+# Cuantil de Chi-Cuadrado con df grados de libertad
+def chi2_ppf(probability, df):
+    return critical_value("chi2", "ppf", float(probability), int(df))
+
+# Cuantil de la distribución normal estándar
+def norm_ppf(probability):
+    return critical_value("norm", "ppf", float(probability))
+
+# Cuantil de la distribución KS de una cola para muestras de tamaño n
+def ksone_ppf(probability, n):
+    return critical_value("ksone", "ppf", float(probability), int(n))
+
+# Valor crítico asintótico de Kolmogorov (sin dividir por la raíz de n)
+def kstwobign_isf(alpha):
+    return critical_value("kstwobign", "isf", float(alpha))
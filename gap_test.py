@@ -0,0 +1,95 @@
+import numpy as np
+from chi2_test import chi_square_comparison
+from critical_values import chi2_ppf
+from plotting import pyplot, show_or_save
+
+class GapTest:
+    """
+    Prueba de huecos: toma los números que caen en [low, high] y mide el hueco entre cada par
+    de apariciones consecutivas (la cantidad de números intermedios que no caen en el intervalo).
+    Con números independientes el hueco i tiene probabilidad p * (1 - p)^i, con p = high - low;
+    los huecos de max_gap o más se agrupan en la última clase. Las frecuencias observadas se
+    comparan con las esperadas con la prueba de Chi-Cuadrado.
+    Las posiciones y los huecos se obtienen con operaciones vectorizadas.
+    """
+    def __init__(self, ri_nums, low=0.0, high=0.5, max_gap=5, alpha=0.05):
+        if not 0 <= low < high <= 1:
+            raise ValueError("El intervalo de la prueba de huecos debe cumplir 0 <= low < high <= 1")
+        self.ri_nums = ri_nums          # Secuencia de números pseudoaleatorios
+        self.n = len(ri_nums)           # Cantidad de números
+        self.low = low                  # Límite inferior del intervalo
+        self.high = high                # Límite superior del intervalo
+        self.max_gap = max_gap          # Huecos de este tamaño o mayores forman la última clase
+        self.alpha = alpha              # Nivel de significancia de la prueba
+        self.gaps_amount = 0            # Cantidad de huecos observados
+        self.prob = []                  # Probabilidad teórica de cada clase de hueco
+        self.oi = []                    # Frecuencias observadas de cada clase
+        self.ei = []                    # Frecuencias esperadas de cada clase
+        self.eid = []                   # Valores (oi - ei)^2 / ei de cada clase
+        self.total_sum = 0.0            # Sumatoria de los valores (oi - ei)^2 / ei
+        self.chi_reverse = 0.0          # Valor crítico de Chi-Cuadrado con max_gap grados de libertad
+        self.passed = False             # Resultado de la prueba
+
+    # Cuenta los huecos de cada tamaño entre apariciones consecutivas en [low, high]
+    def calculate_oi(self):
+        values = np.asarray(self.ri_nums, dtype=np.float64)
+        positions = np.flatnonzero((values >= self.low) & (values <= self.high))
+        gaps = np.diff(positions) - 1
+        self.gaps_amount = int(gaps.size)
+        self.oi = np.bincount(np.minimum(gaps, self.max_gap), minlength=self.max_gap + 1).tolist()
+        return self.oi
+
+    # Calcula la probabilidad de cada clase de hueco y las frecuencias esperadas
+    def calculate_ei(self):
+        p = self.high - self.low
+        self.prob = [p * (1 - p) ** i for i in range(self.max_gap)] + [(1 - p) ** self.max_gap]
+        self.ei = [prob * self.gaps_amount for prob in self.prob]
+
+    # Realiza la prueba de huecos y determina si ha pasado
+    def check_gap(self):
+        self.calculate_oi()
+        self.calculate_ei()
+        if self.gaps_amount == 0:
+            # Sin dos apariciones en el intervalo no hay huecos que comparar y la prueba no se supera
+            self.chi_reverse = chi2_ppf(1 - self.alpha, self.max_gap)
+            self.passed = False
+            return self.passed
+        eid, self.total_sum, self.chi_reverse = chi_square_comparison(self.oi, self.ei, self.alpha)
+        self.eid = eid.tolist()
+        self.passed = self.total_sum <= self.chi_reverse
+        return self.passed
+
+    # Genera un gráfico de barras que compara las frecuencias observadas (oi) y las esperadas (ei).
+    def plot_oi_vs_ei(self, path=None):
+        plt = pyplot(headless=path is not None)
+        labels = [str(i) for i in range(self.max_gap)] + [f">={self.max_gap}"]
+        indice = np.arange(len(labels))
+        ancho = 0.35
+        fig, ax = plt.subplots()
+        ax.bar(indice - ancho / 2, self.oi, ancho, label='Observadas')
+        ax.bar(indice + ancho / 2, self.ei, ancho, label='Esperadas', alpha=0.7)
+        ax.set_xlabel('Tamaño del hueco')
+        ax.set_ylabel('Frecuencia')
+        ax.set_title(f'Prueba de Huecos: Chi2 = {round(self.total_sum, 4)}, Chi2 Crítico = {round(self.chi_reverse, 4)}')
+        ax.set_xticks(indice)
+        ax.set_xticklabels(labels)
+        ax.legend()
+        show_or_save(plt, path)
+
+if __name__ == "__main__":
+    # Solicita al usuario que ingrese los números Ri separados por comas
+    user_input = input("Ingresa los números Ri separados por comas: ")
+    try:
+        ri_nums = [float(x.strip()) for x in user_input.split(",")]
+    except ValueError:
+        print("Error: asegúrate de ingresar únicamente números separados por comas.")
+        exit(1)
+
+    gap_test = GapTest(ri_nums)
+    gap_test.check_gap()
+    print("Huecos observados:", gap_test.gaps_amount)
+    print("Frecuencias observadas:", gap_test.oi)
+    print("Frecuencias esperadas:", gap_test.ei)
+    print("Sumatoria Chi2:", gap_test.total_sum)
+    print("Chi2 crítico:", gap_test.chi_reverse)
+    print("¿Prueba superada?:", gap_test.passed)
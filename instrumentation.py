@@ -0,0 +1,120 @@
+import time
+import tracemalloc
+from functools import wraps
+
+# Etapas de cada clase que se miden por defecto (los métodos que llaman sus pipelines)
+PIPELINE_STAGES = {
+    "AverageTest": ["compute_average", "compute_z", "compute_upper_limit", "compute_lower_limit"],
+    "VarianceTest": ["calculateAverage", "calculateVariance", "calculateChiSquare1", "calculateChiSquare2",
+                     "calculateSuperiorLimit", "calculateInferiorLimit"],
+    "ChiTest": ["fillNiValues", "sortNiArray", "checkTestSorted", "fillIntervalsValuesArray",
+                "buildIntervals",
+                "fillFrequenciesArrays", "fillFrequenciesArraysVectorized", "fillFrequenciesArraysSorted",
+                "fillChiSquaredValuesArray", "fillChiSquaredValuesArrayVectorized",
+                "cumulativeChiSquaredValues", "chi_squared_test_value"],
+    "KsTest": ["checkTestSorted", "calculate_min", "calculate_max", "calculateAverage", "calculate_intervals", "calculate_oi",
+               "calculate_oi_sorted", "calculate_oia", "calculate_prob_oi", "calculate_oia_a",
+               "calculate_prob_esp", "calculate_diff", "calculate_KS"],
+    "StreamingKsTest": ["update_moments", "update_oi"],
+    "PokerTest": ["calculate_oi", "calculate_oi_vectorized", "calculate_ei", "calculate_eid", "calculate_total_sum"],
+    "RunsTest": ["calculate_runs", "calculate_expected", "calculate_z"],
+    "GapTest": ["calculate_oi", "calculate_ei"],
+    "SerialTest": ["count_tuples", "calculate_psi2"],
+    "Battery": ["calculate_shared_values", "run_average_test", "run_variance_test", "run_chi_test",
+                "run_ks_test", "run_poker_test", "run_runs_test", "run_gap_test"],
+}
+
+class StageProfiler:
+    """
+    Mide el tiempo, la cantidad de llamadas y (opcionalmente) el pico de memoria de cada etapa
+    de las pruebas. Solo actúa sobre las instancias que se instrumentan con instrument(),
+    así que las pruebas sin instrumentar no tienen ningún costo adicional.
+    """
+    def __init__(self, memory=False, callback=None):
+        self.memory = memory        # Si es True, mide el pico de memoria de cada etapa con tracemalloc
+        self.callback = callback    # Función opcional callback(etapa, segundos, pico_bytes) por cada llamada
+        self.stats = {}             # Estadísticas por etapa: {"calls", "seconds", "peak_bytes"}
+        self.memory_stack = []      # Memoria inicial y pico parcial de las etapas en curso
+        self.started_tracing = False  # Indica si este perfilador inició tracemalloc
+
+    # Retorna las etapas por defecto de una instancia según su clase y sus clases base
+    def default_stages(self, test):
+        stages = []
+        for cls in type(test).__mro__:
+            for name in PIPELINE_STAGES.get(cls.__name__, []):
+                if name not in stages:
+                    stages.append(name)
+        return stages
+
+    # Reemplaza en la instancia cada método de etapa por una versión medida.
+    # Las estadísticas quedan también en test.stage_stats.
+    def instrument(self, test, stages=None):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        prefix = type(test).__name__
+        for name in stages or self.default_stages(test):
+            method = getattr(test, name, None)
+            if method is not None:
+                setattr(test, name, self.wrap(f"{prefix}.{name}", method))
+        test.stage_stats = self.stats
+        return test
+
+    # Quita los métodos medidos de la instancia y restaura los de su clase
+    def restore(self, test):
+        for name in list(vars(test)):
+            if getattr(vars(test)[name], "__wrapped__", None) is not None:
+                delattr(test, name)
+        vars(test).pop("stage_stats", None)
+        return test
+
+    # Detiene tracemalloc si lo inició este perfilador
+    def close(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    # Envuelve un método para medir cada una de sus llamadas como la etapa stage
+    def wrap(self, stage, method):
+        @wraps(method)
+        def measured(*args, **kwargs):
+            self.enter()
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start, self.leave())
+        return measured
+
+    # Registra la memoria al iniciar una etapa y reinicia el pico de tracemalloc
+    def enter(self):
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self.memory_stack:
+                self.memory_stack[-1][1] = max(self.memory_stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self.memory_stack.append([current, current])
+
+    # Retorna la memoria adicional máxima usada por la etapa que termina (0 si no se mide)
+    def leave(self):
+        if not self.memory_stack:
+            return 0
+        peak = tracemalloc.get_traced_memory()[1]
+        start, partial_peak = self.memory_stack.pop()
+        stage_peak = max(partial_peak, peak)
+        if self.memory_stack:
+            self.memory_stack[-1][1] = max(self.memory_stack[-1][1], stage_peak)
+        return stage_peak - start
+
+    # Acumula una llamada de la etapa y avisa al callback
+    def record(self, stage, seconds, peak_bytes):
+        stats = self.stats.setdefault(stage, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["peak_bytes"] = max(stats["peak_bytes"], peak_bytes)
+        if self.callback is not None:
+            self.callback(stage, seconds, peak_bytes)
+
+    # Retorna las etapas ordenadas de mayor a menor tiempo total
+    def report(self):
+        return sorted(self.stats.items(), key=lambda item: item[1]["seconds"], reverse=True)
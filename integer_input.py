@@ -0,0 +1,31 @@
+import numpy as np
+
+CHUNK_SIZE = 1 << 22    # Palabras procesadas por bloque para acotar la memoria temporal
+
+# Calcula floor(w * m / 2^bits) para palabras enteras sin signo de 8 a 64 bits usando solo
+# multiplicaciones y desplazamientos, es decir, el valor floor(ri * m) con ri = w / 2^bits
+# sin convertir las palabras a float. m debe ser menor que 2^31.
+def scale_words(words, m):
+    words = np.asarray(words)
+    if words.dtype.kind != "u":
+        raise ValueError(f"Se esperaban palabras enteras sin signo, se recibió {words.dtype}")
+    bits = words.dtype.itemsize * 8
+    if bits <= 32:
+        return ((words.astype(np.uint64) * m) >> bits).astype(np.int64)
+    # Para 64 bits se separa la palabra en dos mitades de 32 bits para no desbordar:
+    # floor((h * 2^32 + l) * m / 2^64) = floor((h * m + floor(l * m / 2^32)) / 2^32)
+    high = words >> 32
+    low = words & 0xFFFFFFFF
+    return ((high * m + ((low * m) >> 32)) >> 32).astype(np.int64)
+
+# Cuenta cuántas palabras caen en cada valor de floor(w * m / 2^bits), procesando por bloques.
+# Si se indica table, se cuenta table[valor] en su lugar (por ejemplo, la clase de mano de poker).
+def scaled_counts(words, m, minlength, table=None):
+    words = np.asarray(words)
+    counts = np.zeros(minlength, dtype=np.int64)
+    for start in range(0, words.size, CHUNK_SIZE):
+        values = scale_words(words[start:start + CHUNK_SIZE], m)
+        if table is not None:
+            values = table[values]
+        counts += np.bincount(values, minlength=minlength)
+    return counts
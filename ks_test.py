@@ -1,7 +1,7 @@
 from statistics import mean
-from scipy import stats
-from scipy.stats import norm
-import matplotlib.pyplot as plt
+from critical_values import ksone_ppf, kstwobign_isf
+from plotting import pyplot, show_or_save
+from out_of_core import ExternalSorter, iter_chunks
 import numpy as np
 
 class KsTest:
@@ -26,6 +26,8 @@ class KsTest:
         self.alpha = 0.05
         self.intervals = []         # Lista de intervalos
         self.n_intervals = n_intervals  # Número de intervalos para la prueba
+        self.d_plus = 0             # Estadístico D+ exacto (modo checkTestExact)
+        self.d_minus = 0            # Estadístico D- exacto (modo checkTestExact)
 
     # Calcula la sumatoria acumulada de las frecuencias observadas (oia)
     def calculate_oia(self):
@@ -37,17 +39,17 @@ class KsTest:
     # Calcula el valor mínimo de la secuencia
     def calculate_min(self):
         if self.n != 0:
-            self.min = min(self.ri)
+            self.min = float(np.min(self.ri)) if isinstance(self.ri, np.ndarray) else min(self.ri)
 
     # Calcula el valor máximo de la secuencia
     def calculate_max(self):
         if self.n != 0:
-            self.max = max(self.ri)
+            self.max = float(np.max(self.ri)) if isinstance(self.ri, np.ndarray) else max(self.ri)
 
     # Calcula el promedio de la secuencia
     def calculateAverage(self):
         if self.n != 0:
-            self.average = mean(self.ri)
+            self.average = float(np.mean(self.ri)) if isinstance(self.ri, np.ndarray) else mean(self.ri)
 
     # Ejecuta todos los cálculos y realiza la prueba KS
     def checkTest(self):
@@ -68,14 +70,36 @@ class KsTest:
         else:
             self.passed = False
 
+    # Realiza la prueba KS clásica sin intervalos: compara la función de distribución empírica
+    # de la muestra ordenada con la de U(0, 1) en cada punto. Ordena una copia de ri (O(n log n));
+    # con presorted=True se asume que ri ya está ordenado y el cálculo es O(n).
+    def checkTestExact(self, presorted=False):
+        values = np.asarray(self.ri, dtype=np.float64)
+        if not presorted:
+            values = np.sort(values)
+        self.n = values.size
+        if self.n == 0:
+            return self.passed
+        self.min = float(values[0])
+        self.max = float(values[-1])
+        self.average = float(values.mean())
+        cdf = np.clip(values, 0.0, 1.0)
+        positions = np.arange(1, self.n + 1) / self.n
+        self.d_plus = float(np.max(positions - cdf))
+        self.d_minus = float(np.max(cdf - (positions - 1.0 / self.n)))
+        self.d_max = max(self.d_plus, self.d_minus)
+        self.calculate_KS()
+        self.passed = self.d_max <= self.d_max_p
+        return self.passed
+
     # Calcula el valor crítico de KS según el tamaño de la muestra
     def calculate_KS(self):
         alpha = self.alpha
         n = self.n
         if self.n <= 50 and self.n > 0:
-            critical_value = stats.ksone.ppf(1 - alpha / 2, n)
+            critical_value = ksone_ppf(1 - alpha / 2, n)
         if self.n > 50:
-            critical_value = stats.kstwobign.isf(alpha) / np.sqrt(n)
+            critical_value = kstwobign_isf(alpha) / np.sqrt(n)
         self.d_max_p = critical_value
 
     # Calcula las probabilidades esperadas para cada intervalo
@@ -101,6 +125,10 @@ class KsTest:
 
     # Calcula las frecuencias observadas (oi) en cada intervalo
     def calculate_oi(self):
+        if isinstance(self.ri, np.ndarray):
+            # Los arreglos (p. ej. mapas de memoria de solo lectura) se ordenan en una copia
+            self.ri = np.sort(self.ri)
+            return self.calculate_oi_sorted()
         self.ri.sort()
         self.oi = [0] * self.n_intervals
         # Para cada valor, determinar en qué intervalo se encuentra
@@ -111,18 +139,52 @@ class KsTest:
                     break
         return self.oi
 
+    # Realiza la prueba KS por intervalos cuando ri ya es un arreglo ordenado de forma ascendente:
+    # los extremos salen del primer y último elemento. Si ya se conoce el promedio, se puede pasar.
+    def checkTestSorted(self, average=None):
+        self.min = float(self.ri[0])
+        self.max = float(self.ri[-1])
+        if average is None:
+            self.calculateAverage()
+        else:
+            self.average = average
+        self.calculate_intervals()
+        self.calculate_oi_sorted()
+        self.calculate_oia()
+        self.calculate_prob_oi()
+        self.calculate_oia_a()
+        self.calculate_prob_esp()
+        self.calculate_diff()
+        self.d_max = max(self.diff)
+        self.calculate_KS()
+        self.passed = self.d_max <= self.d_max_p
+        return self.passed
+
+    # Calcula las frecuencias observadas cuando ri ya es un arreglo ordenado de forma ascendente.
+    # Solo hace una búsqueda binaria por límite de intervalo.
+    def calculate_oi_sorted(self):
+        edges = np.array([interval[0] for interval in self.intervals] + [self.intervals[-1][1]])
+        positions = np.searchsorted(self.ri, edges, side='left')
+        self.oi = np.maximum(np.diff(positions), 0).tolist()
+        return self.oi
+
     # Calcula los intervalos utilizados para la prueba KS
     def calculate_intervals(self):
         if self.n != 0:
-            interval_size = (self.max - self.min) / self.n_intervals
-            initial = self.min
-            for _ in range(self.n_intervals):
-                new_interval = (initial, initial + interval_size)
-                self.intervals.append(new_interval)
-                initial = new_interval[1]
+            self.build_intervals(self.min, self.max)
+
+    # Construye n_intervals intervalos contiguos de igual tamaño entre low y high
+    def build_intervals(self, low, high):
+        interval_size = (high - low) / self.n_intervals
+        initial = low
+        for _ in range(self.n_intervals):
+            new_interval = (initial, initial + interval_size)
+            self.intervals.append(new_interval)
+            initial = new_interval[1]
 
     # Genera un gráfico que muestra Dmax y Dmax_p
-    def plotDs(self):
+    def plotDs(self, path=None):
+        plt = pyplot(headless=path is not None)
         labels = ["Dmax (calculado)", "Dmax_p (crítico KS)"]
         values = [self.d_max, self.d_max_p]
         fig, ax = plt.subplots()
@@ -133,10 +195,11 @@ class KsTest:
         for bar, value in zip(bars, values):
             ax.annotate(str(value), xy=(bar.get_x() + bar.get_width() / 2, value),
                         xytext=(0, 1), textcoords='offset points', ha='center', va='bottom')
-        plt.show()
+        show_or_save(plt, path)
 
     # Genera un gráfico que muestra las probabilidades observadas y esperadas en cada intervalo
-    def plotIntervals(self):
+    def plotIntervals(self, path=None):
+        plt = pyplot(headless=path is not None)
         interval_labels = []
         observed_probabilities = []
         expected_probabilities = []
@@ -157,10 +220,11 @@ class KsTest:
         ax.set_xticklabels(interval_labels, rotation=45, ha='right')
         ax.legend()
         plt.tight_layout()
-        plt.show()
+        show_or_save(plt, path)
 
     # Genera un gráfico que muestra las frecuencias observadas en cada intervalo
-    def plotIntervalsFreq(self):
+    def plotIntervalsFreq(self, path=None):
+        plt = pyplot(headless=path is not None)
         interval_labels = []
         observed_frequencies = []
         for i, interval in enumerate(self.intervals):
@@ -183,7 +247,108 @@ class KsTest:
                         ha='center', va='bottom')
         ax.legend()
         plt.tight_layout()
-        plt.show()
+        show_or_save(plt, path)
+
+class StreamingKsTest(KsTest):
+    """
+    Prueba KS en modo streaming: recorre la secuencia por bloques sin materializarla en memoria.
+    Solo conserva los conteos por intervalo, el mínimo, el máximo y la suma de los valores.
+    """
+    def __init__(self, chunks, n_intervals=10, low=None, high=None, chunk_size=65536):
+        super().__init__([], n_intervals)
+        self.chunks = chunks            # Iterable de bloques (listas o arreglos) o de números sueltos
+        self.low = low                  # Límite inferior fijo de los intervalos (opcional)
+        self.high = high                # Límite superior fijo de los intervalos (opcional)
+        self.chunk_size = chunk_size    # Tamaño de bloque al agrupar un iterador de números sueltos
+        self.total = 0.0                # Suma acumulada de los valores
+
+    # Recorre la fuente como bloques de arreglos NumPy, agrupando los números sueltos en bloques
+    def iter_chunks(self):
+        return iter_chunks(self.chunks, self.chunk_size)
+
+    # Actualiza la cantidad, la suma, el mínimo y el máximo con un bloque
+    def update_moments(self, chunk):
+        if chunk.size == 0:
+            return
+        chunk_min = float(chunk.min())
+        chunk_max = float(chunk.max())
+        self.min = chunk_min if self.n == 0 else min(self.min, chunk_min)
+        self.max = chunk_max if self.n == 0 else max(self.max, chunk_max)
+        self.n += chunk.size
+        self.total += float(chunk.sum())
+
+    # Suma al conteo de cada intervalo los valores de un bloque
+    def update_oi(self, counts, edges, chunk):
+        indexes = np.searchsorted(edges, chunk, side='right') - 1
+        indexes = indexes[(indexes >= 0) & (indexes < self.n_intervals)]
+        counts += np.bincount(indexes, minlength=self.n_intervals)
+
+    # Ejecuta la prueba KS recorriendo los bloques.
+    # Con límites fijos, o si la fuente es un iterador de un solo uso, se hace una sola pasada
+    # (sin límites se usa el dominio [0, 1) de los Ri). Si la fuente se puede recorrer de nuevo,
+    # se hace una primera pasada para el mínimo y el máximo y se obtienen los mismos
+    # intervalos que KsTest.
+    def checkTest(self):
+        single_pass = self.low is not None or self.high is not None or iter(self.chunks) is self.chunks
+        counts = np.zeros(self.n_intervals, dtype=np.int64)
+        if single_pass:
+            low = 0.0 if self.low is None else self.low
+            high = 1.0 if self.high is None else self.high
+            self.build_intervals(low, high)
+            edges = np.array([interval[0] for interval in self.intervals] + [self.intervals[-1][1]])
+            for chunk in self.iter_chunks():
+                self.update_moments(chunk)
+                self.update_oi(counts, edges, chunk)
+        else:
+            for chunk in self.iter_chunks():
+                self.update_moments(chunk)
+            self.calculate_intervals()
+            edges = np.array([interval[0] for interval in self.intervals] + [self.intervals[-1][1]])
+            for chunk in self.iter_chunks():
+                self.update_oi(counts, edges, chunk)
+        if self.n != 0:
+            self.average = self.total / self.n
+        self.oi = counts.tolist()
+        self.calculate_oia()
+        self.calculate_prob_oi()
+        self.calculate_oia_a()
+        self.calculate_prob_esp()
+        self.calculate_diff()
+        self.d_max = max(self.diff)
+        self.calculate_KS()
+        self.passed = self.d_max <= self.d_max_p
+
+class ExternalKsTest(StreamingKsTest):
+    """
+    Prueba KS para secuencias más grandes que la memoria. checkTest (heredado) cuenta por
+    intervalos sin ordenar; checkTestExact calcula D+ y D- exactos con un ordenamiento externo
+    en archivos temporales. En ningún caso se guarda toda la secuencia en memoria ni se modifica.
+    """
+    def __init__(self, chunks, n_intervals=10, run_size=1 << 24, block_size=1 << 16, directory=None):
+        super().__init__(chunks, n_intervals)
+        self.run_size = run_size        # Valores por tramo ordenado en memoria
+        self.block_size = block_size    # Valores por bloque en la mezcla de los tramos
+        self.directory = directory      # Directorio de los archivos temporales (None: el del sistema)
+
+    # Calcula D+ y D- frente a U(0, 1) recorriendo los bloques ordenados de la mezcla externa
+    def checkTestExact(self):
+        with ExternalSorter(self.iter_chunks(), self.run_size, self.block_size, self.directory) as sorter:
+            total = sorter.n
+            offset = 0
+            for block in sorter.blocks():
+                self.update_moments(block)
+                cdf = np.clip(block, 0.0, 1.0)
+                positions = (offset + np.arange(1, block.size + 1)) / total
+                self.d_plus = max(self.d_plus, float(np.max(positions - cdf)))
+                self.d_minus = max(self.d_minus, float(np.max(cdf - (positions - 1.0 / total))))
+                offset += block.size
+        if self.n == 0:
+            return self.passed
+        self.average = self.total / self.n
+        self.d_max = max(self.d_plus, self.d_minus)
+        self.calculate_KS()
+        self.passed = self.d_max <= self.d_max_p
+        return self.passed
 
 if __name__ == "__main__":
     # Solicita al usuario que ingrese los números Ri separados por comas
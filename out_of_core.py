@@ -0,0 +1,110 @@
+import itertools
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Recorre una fuente como bloques float64 de a lo sumo chunk_size valores.
+# Acepta un arreglo NumPy (se recorre con vistas), un iterable de bloques o un iterable de
+# números sueltos (que se agrupan en bloques).
+def iter_chunks(source, chunk_size=65536):
+    if isinstance(source, np.ndarray):
+        for start in range(0, source.size, chunk_size):
+            yield np.asarray(source[start:start + chunk_size], dtype=np.float64)
+        return
+    iterator = iter(source)
+    for first in iterator:
+        break
+    else:
+        return
+    if np.ndim(first) == 0:
+        values = itertools.chain([first], iterator)
+        while True:
+            chunk = np.fromiter(itertools.islice(values, chunk_size), dtype=np.float64)
+            if chunk.size == 0:
+                return
+            yield chunk
+    else:
+        yield np.asarray(first, dtype=np.float64)
+        for chunk in iterator:
+            yield np.asarray(chunk, dtype=np.float64)
+
+# Escribe los bloques en un archivo binario float64 y lo retorna como mapa de memoria de solo lectura.
+# Permite recorrer más de una vez una fuente que solo se puede leer una vez.
+def spill_chunks(chunks, path):
+    with open(path, "wb") as file:
+        for chunk in chunks:
+            np.ascontiguousarray(chunk, dtype=np.float64).tofile(file)
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=np.float64)
+    return np.memmap(path, dtype=np.float64, mode="r")
+
+class ExternalSorter:
+    """
+    Ordenamiento externo: ordena la secuencia por tramos de run_size valores que se guardan en
+    archivos temporales y luego los mezcla en streaming, entregando bloques ordenados.
+    La memoria usada es del orden de run_size más un bloque por tramo; la entrada no se modifica.
+    Se usa como administrador de contexto para borrar los archivos temporales al terminar.
+    """
+    def __init__(self, chunks, run_size=1 << 24, block_size=1 << 16, directory=None):
+        self.chunks = chunks            # Bloques de la secuencia a ordenar
+        self.run_size = run_size        # Valores por tramo ordenado en memoria
+        self.block_size = block_size    # Valores leídos de cada tramo en cada paso de la mezcla
+        self.directory = directory      # Directorio para los archivos temporales (None: el del sistema)
+        self.temp_dir = None            # Directorio temporal creado
+        self.run_paths = []             # Archivos de los tramos ordenados
+        self.n = 0                      # Cantidad total de valores
+
+    def __enter__(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="external_sort_", dir=self.directory)
+        self.write_runs()
+        return self
+
+    def __exit__(self, *exc_info):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.temp_dir = None
+
+    # Ordena y guarda un tramo
+    def save_run(self, values):
+        path = os.path.join(self.temp_dir, f"run_{len(self.run_paths)}.npy")
+        np.save(path, np.sort(values))
+        self.run_paths.append(path)
+        self.n += values.size
+
+    # Agrupa los bloques de entrada en tramos de run_size valores, los ordena y los guarda
+    def write_runs(self):
+        pending = []
+        pending_size = 0
+        for chunk in iter_chunks(self.chunks, self.block_size):
+            pending.append(chunk)
+            pending_size += chunk.size
+            while pending_size >= self.run_size:
+                values = np.concatenate(pending)
+                self.save_run(values[:self.run_size])
+                pending = [values[self.run_size:]]
+                pending_size = pending[0].size
+        if pending_size:
+            self.save_run(np.concatenate(pending))
+
+    # Mezcla los tramos y entrega bloques ordenados. En cada paso se toma como umbral el menor
+    # de los últimos valores leídos de los tramos que aún tienen datos pendientes: todo lo que no
+    # lo supera ya está en su posición final y se entrega ordenado.
+    def blocks(self):
+        runs = [np.load(path, mmap_mode="r") for path in self.run_paths]
+        positions = [0] * len(runs)
+        buffers = [np.empty(0, dtype=np.float64) for _ in runs]
+        while True:
+            for i, run in enumerate(runs):
+                if buffers[i].size == 0 and positions[i] < run.size:
+                    buffers[i] = np.array(run[positions[i]:positions[i] + self.block_size])
+                    positions[i] += buffers[i].size
+            if all(buffer.size == 0 for buffer in buffers):
+                return
+            limits = [buffers[i][-1] for i, run in enumerate(runs) if positions[i] < run.size]
+            threshold = min(limits) if limits else np.inf
+            ready = []
+            for i, buffer in enumerate(buffers):
+                cut = np.searchsorted(buffer, threshold, side="right")
+                ready.append(buffer[:cut])
+                buffers[i] = buffer[cut:]
+            yield np.sort(np.concatenate(ready))
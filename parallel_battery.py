@@ -0,0 +1,56 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from battery import Battery
+
+# Lee un archivo de texto con números Ri separados por comas, espacios o saltos de línea
+def load_sequence(path):
+    with open(path) as file:
+        text = file.read()
+    return np.array(text.replace(",", " ").split(), dtype=np.float64)
+
+# Ejecuta la batería sobre una secuencia (o la ruta de un archivo) dentro de un proceso trabajador.
+# El resultado solo tiene los resultados compactos, así que la secuencia no se copia de vuelta
+# al proceso principal.
+def run_battery_task(task):
+    sequence, intervals_amount, a, b, ks_intervals = task
+    if isinstance(sequence, (str, os.PathLike)):
+        sequence = load_sequence(sequence)
+    return Battery(sequence, intervals_amount, a, b, ks_intervals).run()
+
+# Ejecuta la batería sobre muchas secuencias independientes en un grupo de procesos.
+# Entrega los resultados a medida que terminan, siempre en el mismo orden de las secuencias.
+# Solo se mantienen en vuelo unas pocas tareas por trabajador, así que las secuencias
+# se leen (o se cargan desde archivo) a medida que se necesitan.
+def run_batteries(sequences, workers=None, intervals_amount=8, a=8, b=10, ks_intervals=10):
+    tasks = ((sequence, intervals_amount, a, b, ks_intervals) for sequence in sequences)
+    if workers == 1:
+        for task in tasks:
+            yield run_battery_task(task)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(run_battery_task, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+if __name__ == "__main__":
+    # Solicita las rutas de los archivos con las secuencias, separadas por comas
+    user_input = input("Ingresa las rutas de los archivos separadas por comas: ")
+    paths = [path.strip() for path in user_input.split(",") if path.strip()]
+
+    workers_input = input("Ingresa la cantidad de procesos (por defecto todos los núcleos): ")
+    try:
+        workers = int(workers_input) if workers_input else None
+    except ValueError:
+        print("Error: La cantidad de procesos debe ser un número entero. Se usarán todos los núcleos.")
+        workers = None
+
+    # Ejecuta la batería sobre cada archivo y muestra el resultado a medida que termina
+    for path, result in zip(paths, run_batteries(paths, workers)):
+        print(path, result.summary(), "¿Batería superada?:", result.passed)
@@ -0,0 +1,19 @@
+import sys
+
+# Importa matplotlib.pyplot solo cuando se va a graficar.
+# Con headless=True, si pyplot aún no se ha cargado, se usa el backend no interactivo Agg
+# para poder guardar los gráficos en archivos sin pantalla.
+def pyplot(headless=False):
+    if headless and "matplotlib.pyplot" not in sys.modules:
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+# Muestra la figura actual o, si se indica una ruta, la guarda en ese archivo y la cierra
+def show_or_save(plt, path=None):
+    if path is None:
+        plt.show()
+    else:
+        plt.savefig(path)
+        plt.close()
@@ -1,20 +1,105 @@
+import math
 from numpy import mean, var
 import numpy as np
-import scipy.stats as st
-import matplotlib.pyplot as plt
+from critical_values import chi2_ppf
+from integer_input import scale_words, scaled_counts
+from plotting import pyplot, show_or_save
+
+HAND_DIGITS = 5         # Cantidad de decimales que forman una mano por defecto
+MAX_HAND_DIGITS = 7     # Longitud de mano máxima soportada (la tabla tiene 10^k entradas)
+_hand_categories = {}   # Categorías y probabilidades teóricas por longitud de mano
+_hand_tables = {}       # Tabla de clases de mano por longitud de mano (se construye una vez)
+HAND_TABLE_CHUNK = 1 << 18  # Códigos procesados por bloque al construir la tabla de clases
+
+# Genera las particiones de total en a lo sumo parts partes, cada una de tamaño a lo sumo largest,
+# como tuplas ordenadas de mayor a menor (cada partición es un patrón de repeticiones de dígitos)
+def partitions(total, largest=None, parts=10):
+    largest = total if largest is None else largest
+    if total == 0:
+        yield ()
+        return
+    if parts == 0:
+        return
+    for first in range(min(total, largest), 0, -1):
+        for rest in partitions(total - first, first, parts - 1):
+            yield (first,) + rest
+
+# Retorna (patrones, probabilidades) de las manos de hand_digits dígitos.
+# Los patrones van en orden lexicográfico, que para 5 dígitos es D, O, T, K, F, P, Q.
+# La cantidad de manos de un patrón con r grupos es
+# 10! / (10 - r)! / (grupos del mismo tamaño)! * k! / (tamaño de cada grupo)!
+def hand_categories(hand_digits=HAND_DIGITS):
+    if not 2 <= hand_digits <= MAX_HAND_DIGITS:
+        raise ValueError(f"La longitud de la mano debe estar entre 2 y {MAX_HAND_DIGITS}")
+    if hand_digits not in _hand_categories:
+        patterns = sorted(partitions(hand_digits))
+        probabilities = []
+        for pattern in patterns:
+            ways = math.perm(10, len(pattern)) * math.factorial(hand_digits)
+            for size in set(pattern):
+                ways //= math.factorial(pattern.count(size))
+            for size in pattern:
+                ways //= math.factorial(size)
+            probabilities.append(ways / 10 ** hand_digits)
+        _hand_categories[hand_digits] = (patterns, probabilities)
+    return _hand_categories[hand_digits]
+
+# Construye (una sola vez por longitud) la tabla con la clase de mano de cada entero de
+# hand_digits dígitos. Los índices de clase siguen el orden de hand_categories.
+# Los códigos se procesan por bloques para que la memoria temporal no crezca con 10^hand_digits.
+def hand_classes_table(hand_digits=HAND_DIGITS):
+    if hand_digits not in _hand_tables:
+        patterns, _ = hand_categories(hand_digits)
+        size = 10 ** hand_digits
+        base = hand_digits + 1
+        # Cada patrón (cantidades ordenadas de mayor a menor) se codifica en base hand_digits + 1,
+        # lo que conserva el orden lexicográfico de los patrones
+        pattern_keys = np.array([sum(part * base ** (9 - i) for i, part in enumerate(pattern)) for pattern in patterns])
+        table = np.empty(size, dtype=np.int8)
+        for start in range(0, size, HAND_TABLE_CHUNK):
+            codes = np.arange(start, min(start + HAND_TABLE_CHUNK, size))
+            counts = np.zeros((codes.size, 10), dtype=np.int8)
+            flat = counts.reshape(-1)
+            offsets = np.arange(0, codes.size * 10, 10)
+            remaining = codes.copy()
+            for _ in range(hand_digits):
+                # Los dígitos de un mismo código pueden repetirse, así que se suman de a una posición
+                flat[offsets + remaining % 10] += 1
+                remaining //= 10
+            counts.sort(axis=1)
+            keys = np.zeros(codes.size, dtype=np.int64)
+            for column in range(9, -1, -1):
+                keys *= base
+                keys += counts[:, column]
+            table[start:start + codes.size] = np.searchsorted(pattern_keys, keys)
+        _hand_tables[hand_digits] = table
+    return _hand_tables[hand_digits]
+
+# Obtiene los primeros hand_digits decimales de cada número como un entero, usando solo aritmética.
+# El pequeño margen evita que valores como 0.12345 queden en 12344 por el redondeo binario.
+# Las palabras enteras sin signo se toman como w / 2^bits y sus dígitos salen de
+# multiplicaciones y desplazamientos enteros, sin pasar por float.
+def hand_codes(ri_nums, hand_digits=HAND_DIGITS):
+    scale = 10 ** hand_digits
+    if isinstance(ri_nums, np.ndarray) and ri_nums.dtype.kind == "u":
+        return scale_words(ri_nums, scale)
+    values = np.asarray(ri_nums, dtype=np.float64)
+    return np.floor(values * scale + scale * 1e-14).astype(np.int64) % scale
 
 class PokerTest:
 
-    def __init__(self, ri_nums):
+    def __init__(self, ri_nums, alpha=0.05, hand_digits=HAND_DIGITS):
         self.ri_nums = ri_nums              # Lista de números pseudoaleatorios en el rango [0, 1)
-        self.prob = [0.3024, 0.504, 0.108, 0.072, 0.009, 0.0045, 0.0001]  # Probabilidades teóricas de cada mano de poker
-        self.oi = [0, 0, 0, 0, 0, 0, 0]      # Frecuencias observadas de cada mano
+        self.hand_digits = hand_digits      # Cantidad de decimales que forman cada mano
+        self.hands, self.prob = hand_categories(hand_digits)  # Patrones y probabilidades teóricas de cada mano de poker
+        self.oi = [0] * len(self.prob)      # Frecuencias observadas de cada mano
         self.ei = []                        # Frecuencias esperadas de cada mano (se calcularán según prob y n)
         self.eid = []                       # Valores (oi - ei)^2 / ei para cada mano
         self.passed = False                 # Resultado de la prueba (True si pasó, False si no)
         self.n = len(ri_nums)               # Número de elementos en la secuencia de números pseudoaleatorios
         self.total_sum = 0.0                # Suma total de los valores calculados (oi - ei)^2 / ei
-        self.chi_reverse = st.chi2.ppf(1 - 0.05, 6)  # Valor crítico de chi-cuadrado para 6 grados de libertad y nivel 0.05
+        self.alpha = alpha                  # Nivel de significancia de la prueba
+        self.chi_reverse = chi2_ppf(1 - alpha, len(self.prob) - 1)  # Valor crítico de chi-cuadrado con (manos - 1) grados de libertad y nivel alpha
 
     # Realiza la prueba de poker y determina si ha pasado.
     def check_poker(self):
@@ -28,6 +113,27 @@ class PokerTest:
             self.passed = False
         return self.passed
 
+    # Realiza la prueba de poker clasificando las manos con la tabla precalculada.
+    def check_poker_vectorized(self):
+        self.calculate_oi_vectorized()
+        self.calculate_ei()
+        self.calculate_eid()
+        self.calculate_total_sum()
+        self.passed = self.total_sum < self.chi_reverse
+        return self.passed
+
+    # Calcula las frecuencias observadas en una sola pasada: cada número se convierte en un
+    # entero de 5 dígitos y su mano se obtiene indexando la tabla de clases.
+    def calculate_oi_vectorized(self):
+        if isinstance(self.ri_nums, np.ndarray) and self.ri_nums.dtype.kind == "u":
+            # Las palabras enteras se clasifican por bloques para acotar la memoria temporal
+            counts = scaled_counts(self.ri_nums, 10 ** self.hand_digits, len(self.prob), hand_classes_table(self.hand_digits))
+        else:
+            classes = hand_classes_table(self.hand_digits)[hand_codes(self.ri_nums, self.hand_digits)]
+            counts = np.bincount(classes, minlength=len(self.prob))
+        self.oi = counts.tolist()
+        return self.oi
+
     # Calcula la suma total de (oi - ei)^2 / ei para cada mano.
     def calculate_total_sum(self):
         for num in self.eid:
@@ -35,6 +141,9 @@ class PokerTest:
 
     # Calcula las frecuencias observadas de cada mano de poker.
     def calculate_oi(self):
+        if self.hand_digits != HAND_DIGITS:
+            # La clasificación por cadenas solo distingue las 7 manos de 5 dígitos
+            return self.calculate_oi_vectorized()
         for n in self.ri_nums:
             # Convertir el número a cadena y separar en la parte decimal.
             arr = str(n).split(".")
@@ -100,7 +209,7 @@ class PokerTest:
 
     # Calcula las frecuencias esperadas de cada mano de poker.
     def calculate_ei(self):
-        for i in range(7):
+        for i in range(len(self.prob)):
             self.ei.append(self.prob[i] * self.n)
 
     # Calcula (oi - ei)^2 / ei para cada mano.
@@ -111,7 +220,8 @@ class PokerTest:
                 self.eid.append(((self.oi[i] - expected) ** 2) / expected)
 
     # Genera un gráfico de barras que compara total_sum con el valor crítico chi_reverse.
-    def plot_totalSum_vs_chiReverse(self):
+    def plot_totalSum_vs_chiReverse(self, path=None):
+        plt = pyplot(headless=path is not None)
         if self.n != 0:
             x = ['SUM ((Oi - Ei)^2/Ei)', 'Chi2 Crítico']
             y = [self.total_sum, self.chi_reverse]
@@ -124,12 +234,15 @@ class PokerTest:
             for bar, value in zip(bars, y):
                 ax.annotate(str(round(value, 4)), xy=(bar.get_x() + bar.get_width() / 2, value),
                             xytext=(0, 3), textcoords="offset points", ha='center', va='bottom')
-            plt.show()
+            show_or_save(plt, path)
 
     # Genera un gráfico de barras que compara las frecuencias observadas (oi) y las esperadas (ei).
-    def plot_oi_vs_ei(self):
+    def plot_oi_vs_ei(self, path=None):
+        plt = pyplot(headless=path is not None)
         if self.n != 0:
             hands = ['D', 'O', 'T', 'K', 'F', 'P', 'Q']  # D: Todas diferentes, O: Un par, T: Dos pares, K: Tercia, F: Full house, P: Poker, Q: Todas iguales
+            if self.hand_digits != HAND_DIGITS:
+                hands = [''.join(map(str, pattern)) for pattern in self.hands]  # Patrón de repeticiones, p. ej. 211
             indice = np.arange(len(hands))
             ancho = 0.35
             fig, ax = plt.subplots()
@@ -141,7 +254,7 @@ class PokerTest:
             ax.set_xticks(indice)
             ax.set_xticklabels(hands)
             ax.legend()
-            plt.show()
+            show_or_save(plt, path)
 
 if __name__ == "__main__":
     # Solicita al usuario que ingrese los números Ri separados por comas
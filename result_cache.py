@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import numpy as np
+from battery import Battery, TEST_NAMES
+
+HASH_CHUNK = 1 << 24    # Bytes del arreglo que se pasan al hash en cada actualización
+# Versión de los resultados guardados; forma parte de la llave y se incrementa cuando cambia el
+# cálculo de alguna prueba (o el formato de los registros) para no servir resultados anteriores
+CACHE_VERSION = 2
+
+class ResultCache:
+    """
+    Caché en disco de los resultados de la batería, indexada por un hash del contenido de la
+    secuencia y de los parámetros de las pruebas. Cada entrada es un archivo JSON pequeño;
+    cuando el tamaño total supera max_bytes se borran las entradas usadas hace más tiempo (LRU).
+    """
+    def __init__(self, directory, max_bytes=64 * 2 ** 20):
+        self.directory = directory      # Directorio de las entradas de la caché
+        self.max_bytes = max_bytes      # Tamaño máximo total de las entradas
+        os.makedirs(directory, exist_ok=True)
+
+    # Calcula la llave de una secuencia y sus parámetros con BLAKE2b sobre los bytes del arreglo,
+    # incluyendo CACHE_VERSION
+    def key(self, values, params):
+        values = np.asarray(values)
+        if values.dtype == object or values.dtype.kind not in "fiu":
+            values = np.asarray(values, dtype=np.float64)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps({"version": CACHE_VERSION, "dtype": values.dtype.str, "size": int(values.size), **params},
+                                 sort_keys=True).encode())
+        flat = values.reshape(-1)
+        step = max(1, HASH_CHUNK // max(1, values.itemsize))
+        for start in range(0, flat.size, step):
+            digest.update(np.ascontiguousarray(flat[start:start + step]).data)
+        return digest.hexdigest()
+
+    # Ruta del archivo de una llave
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    # Retorna los registros guardados para la llave (o None) y la marca como usada recientemente
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path) as file:
+                records = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return records
+
+    # Guarda los registros de una llave y aplica el límite de tamaño
+    def put(self, key, records):
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(records, file)
+        os.replace(temp_path, path)
+        self.evict()
+
+    # Borra las entradas menos usadas recientemente hasta quedar bajo max_bytes
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+# Ejecuta la batería sobre la secuencia o retorna sus registros desde la caché si ya se calcularon
+# con los mismos datos y parámetros. Retorna la lista de BatteryResult.records().
+def cached_records(ri_values, cache, tests=TEST_NAMES, intervals_amount=8, a=8, b=10, ks_intervals=10, alpha=0.05):
+    params = {"tests": list(tests), "intervals_amount": intervals_amount, "a": a, "b": b,
+              "ks_intervals": ks_intervals, "alpha": alpha}
+    key = cache.key(ri_values, params)
+    records = cache.get(key)
+    if records is None:
+        records = Battery(ri_values, intervals_amount, a, b, ks_intervals, alpha).run(tests).records()
+        cache.put(key, records)
+    return records
@@ -0,0 +1,82 @@
+import numpy as np
+
+# Convierte datos por intervalo (o por categoría) en un arreglo compacto de solo lectura
+def frozen_array(values, dtype):
+    if values is None or len(values) == 0:
+        return None
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+class TestResult:
+    """
+    Resultado liviano e inmutable de una prueba evaluada: solo guarda el estadístico, el valor
+    crítico o los límites, el veredicto y los datos por intervalo como arreglos de solo lectura
+    (frecuencias observadas, esperadas y límites de los intervalos). No retiene la secuencia
+    ni las listas intermedias de la prueba.
+    """
+    __slots__ = ("name", "n", "passed", "statistic", "critical", "lower", "upper",
+                 "observed", "expected", "edges")
+
+    def __init__(self, name, n, passed, statistic, critical=None, lower=None, upper=None,
+                 observed=None, expected=None, edges=None):
+        values = {
+            "name": name,                                   # Nombre de la prueba en la batería
+            "n": int(n),                                    # Cantidad de números evaluados
+            "passed": bool(passed),                         # Resultado de la prueba
+            "statistic": None if statistic is None else float(statistic),  # Estadístico de la prueba
+            "critical": None if critical is None else float(critical),     # Valor crítico
+            "lower": None if lower is None else float(lower),  # Límite inferior de aceptación
+            "upper": None if upper is None else float(upper),  # Límite superior de aceptación
+            "observed": frozen_array(observed, np.int64),   # Frecuencias observadas por intervalo
+            "expected": frozen_array(expected, np.float64),  # Frecuencias esperadas por intervalo
+            "edges": frozen_array(edges, np.float64),       # Límites de los intervalos
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    # Permite enviar el resultado a otro proceso a pesar de ser inmutable
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, key) for key in self.__slots__))
+
+    def __repr__(self):
+        return (f"TestResult(name={self.name!r}, n={self.n}, passed={self.passed}, "
+                f"statistic={self.statistic}, critical={self.critical}, lower={self.lower}, upper={self.upper})")
+
+    # Retorna la fila de resultados: estadístico, valor crítico o límites y resultado
+    def record(self):
+        return {"test": self.name, "n": self.n, "passed": self.passed, "statistic": self.statistic,
+                "critical": self.critical, "lower": self.lower, "upper": self.upper}
+
+# Crea el resultado compacto de una prueba de la batería ya evaluada
+def test_result(name, test):
+    if name == "average":
+        return TestResult(name, test.n, test.passed, test.average,
+                          lower=test.lower_limit, upper=test.upper_limit)
+    if name == "variance":
+        return TestResult(name, test.n, test.passed, test.variance,
+                          lower=test.inferior_limit, upper=test.superior_limit)
+    if name == "chi2":
+        return TestResult(name, test.num_amount, test.passed, test.sumChi2, test.chiReverse,
+                          observed=test.frequency_obtained, expected=test.expected_frequency,
+                          edges=test.intervals_values)
+    if name == "ks":
+        edges = [interval[0] for interval in test.intervals] + [test.intervals[-1][1]] if test.intervals else None
+        expected = [test.n / test.n_intervals] * len(test.oi) if len(test.oi) else None
+        return TestResult(name, test.n, test.passed, test.d_max, test.d_max_p,
+                          observed=test.oi, expected=expected, edges=edges)
+    if name == "poker":
+        return TestResult(name, test.n, test.passed, test.total_sum, test.chi_reverse,
+                          observed=test.oi, expected=[p * test.n for p in test.prob])
+    if name == "runs":
+        return TestResult(name, test.n, test.passed, test.z, lower=-test.z_critical, upper=test.z_critical)
+    if name == "gap":
+        return TestResult(name, test.n, test.passed, test.total_sum, test.chi_reverse,
+                          observed=test.oi, expected=test.ei)
+    raise ValueError(f"Prueba desconocida: {name}")
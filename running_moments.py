@@ -0,0 +1,39 @@
+import numpy as np
+
+class RunningMoments:
+    """
+    Acumulador en línea de la cantidad, el promedio y la suma de cuadrados de las desviaciones (M2).
+    Recibe los valores por bloques y se puede combinar con otros acumuladores (algoritmo de Chan/Welford).
+    """
+    def __init__(self):
+        self.n = 0          # Cantidad de valores acumulados
+        self.mean = 0.0     # Promedio de los valores acumulados
+        self.m2 = 0.0       # Suma de (x - promedio)^2 de los valores acumulados
+
+    # Agrega un bloque de valores (o un único número); el bloque se resume con sumas por pares de NumPy
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size != 0:
+            chunk_mean = float(values.mean())
+            chunk_m2 = float(np.square(values - chunk_mean).sum())
+            self.combine(values.size, chunk_mean, chunk_m2)
+        return self
+
+    # Combina con el resumen (n, promedio, M2) de otro conjunto de valores
+    def combine(self, n, mean, m2):
+        if n == 0:
+            return self
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        return self
+
+    # Combina con otro acumulador (por ejemplo, el de otro proceso trabajador)
+    def merge(self, other):
+        return self.combine(other.n, other.mean, other.m2)
+
+    # Varianza poblacional de los valores acumulados (igual a numpy.var)
+    def variance(self):
+        return self.m2 / self.n if self.n else 0.0
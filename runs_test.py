@@ -0,0 +1,85 @@
+from math import sqrt
+import numpy as np
+from critical_values import norm_ppf
+from plotting import pyplot, show_or_save
+
+class RunsTest:
+    """
+    Prueba de corridas arriba y abajo: detecta correlación entre números consecutivos.
+    Cada par consecutivo se marca como subida (ri+1 > ri) o bajada (ri+1 <= ri) y se cuentan
+    las corridas (secuencias máximas de subidas o de bajadas). Con n números independientes la
+    cantidad de corridas tiene promedio (2n - 1) / 3 y varianza (16n - 29) / 90, y el estadístico
+    Z se compara con el valor crítico normal de nivel alpha / 2.
+    Se calcula con comparaciones vectorizadas, sin recorrer la secuencia en Python.
+    """
+    def __init__(self, ri_nums, alpha=0.05):
+        self.ri_nums = ri_nums          # Secuencia de números pseudoaleatorios
+        self.n = len(ri_nums)           # Cantidad de números
+        self.alpha = alpha              # Nivel de significancia de la prueba
+        self.runs = 0                   # Cantidad de corridas observadas
+        self.expected_runs = 0.0        # Promedio de corridas esperado
+        self.variance_runs = 0.0        # Varianza esperada de la cantidad de corridas
+        self.z = 0.0                    # Estadístico Z de la cantidad de corridas
+        self.z_critical = 0.0           # Valor crítico normal de nivel alpha / 2
+        self.passed = False             # Resultado de la prueba
+
+    # Cuenta las corridas: una corrida nueva empieza cada vez que cambia la dirección
+    def calculate_runs(self):
+        values = np.asarray(self.ri_nums, dtype=np.float64)
+        if values.size < 2:
+            self.runs = 0
+            return self.runs
+        ups = values[1:] > values[:-1]
+        self.runs = 1 + int(np.count_nonzero(ups[1:] != ups[:-1]))
+        return self.runs
+
+    # Calcula el promedio y la varianza de la cantidad de corridas para n números independientes
+    def calculate_expected(self):
+        self.expected_runs = (2 * self.n - 1) / 3
+        self.variance_runs = (16 * self.n - 29) / 90
+
+    # Calcula el estadístico Z y el valor crítico
+    def calculate_z(self):
+        self.z = (self.runs - self.expected_runs) / sqrt(self.variance_runs)
+        self.z_critical = norm_ppf(1 - self.alpha / 2)
+
+    # Realiza la prueba de corridas y determina si ha pasado
+    def check_runs(self):
+        if self.n < 2:
+            raise ValueError("La prueba de corridas necesita al menos 2 números")
+        self.calculate_runs()
+        self.calculate_expected()
+        self.calculate_z()
+        self.passed = abs(self.z) <= self.z_critical
+        return self.passed
+
+    # Genera un gráfico de barras que compara Z con los valores críticos
+    def plot_z(self, path=None):
+        plt = pyplot(headless=path is not None)
+        categories = ["-Z Crítico", "Z", "Z Crítico"]
+        values = [-self.z_critical, self.z, self.z_critical]
+        fig, ax = plt.subplots()
+        bars = plt.bar(categories, values, color=['red', 'blue', 'green'])
+        plt.title("Prueba de Corridas: Z vs Valores Críticos")
+        plt.ylabel("Valor")
+        for bar, value in zip(bars, values):
+            ax.annotate(str(round(value, 4)), xy=(bar.get_x() + bar.get_width() / 2, value),
+                        xytext=(0, 1), textcoords="offset points", ha="center", va="bottom")
+        show_or_save(plt, path)
+
+if __name__ == "__main__":
+    # Solicita al usuario que ingrese los números Ri separados por comas
+    user_input = input("Ingresa los números Ri separados por comas: ")
+    try:
+        ri_nums = [float(x.strip()) for x in user_input.split(",")]
+    except ValueError:
+        print("Error: asegúrate de ingresar únicamente números separados por comas.")
+        exit(1)
+
+    runs_test = RunsTest(ri_nums)
+    runs_test.check_runs()
+    print("Corridas observadas:", runs_test.runs)
+    print("Corridas esperadas:", runs_test.expected_runs)
+    print("Z:", runs_test.z)
+    print("Z crítico:", runs_test.z_critical)
+    print("¿Prueba superada?:", runs_test.passed)
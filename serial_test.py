@@ -0,0 +1,129 @@
+import numpy as np
+from chi2_test import uniform_chi_square
+from critical_values import chi2_ppf
+from integer_input import CHUNK_SIZE
+
+DENSE_CELLS = 1 << 22   # Hasta esta cantidad de celdas el conteo usa un histograma denso
+
+class SerialTest:
+    """
+    Prueba serial de Chi-Cuadrado sobre d-tuplas solapadas (r1..rd), (r2..rd+1), ... tomadas de
+    forma circular, cada una asignada a una de las k^d celdas según el intervalo de cada número.
+    Como las tuplas solapadas no son independientes, se usa el estadístico de Good:
+    psi2(d) - psi2(d - 1), que sigue una Chi-Cuadrado con k^d - k^(d-1) grados de libertad.
+    Cada tupla se codifica como un entero (su número de celda) con operaciones vectorizadas por
+    bloques. Con pocas celdas se cuentan en un histograma denso; con muchas, solo se guardan las
+    celdas ocupadas (claves enteras ordenadas y sus conteos), así que la memoria depende de la
+    cantidad de tuplas distintas y no de k^d.
+    """
+    def __init__(self, ri_nums, intervals_amount=8, dimension=2, alpha=0.05, sparse=None, chunk_size=CHUNK_SIZE):
+        if dimension < 2 or intervals_amount < 2:
+            raise ValueError("La prueba serial necesita dimension >= 2 e intervals_amount >= 2")
+        if intervals_amount ** dimension > 2 ** 62:
+            raise ValueError("Demasiadas celdas: intervals_amount ^ dimension debe caber en un entero de 64 bits")
+        self.ri_nums = ri_nums                  # Secuencia de números pseudoaleatorios
+        self.n = len(ri_nums)                   # Cantidad de números (y de tuplas circulares)
+        self.intervals_amount = intervals_amount  # Intervalos por dimensión (k)
+        self.dimension = dimension              # Cantidad de números por tupla (d)
+        self.alpha = alpha                      # Nivel de significancia de la prueba
+        self.cells = intervals_amount ** dimension  # Cantidad de celdas (k^d)
+        self.sparse = self.cells > DENSE_CELLS if sparse is None else sparse  # Conteo disperso o denso
+        self.chunk_size = chunk_size            # Tuplas codificadas por bloque
+        self.keys = None                        # Celdas ocupadas (disperso) o None (denso)
+        self.counts = None                      # Conteo de cada celda ocupada (disperso) o de todas (denso)
+        self.occupied_cells = 0                 # Cantidad de celdas con al menos una tupla
+        self.psi2 = 0.0                         # Chi-Cuadrado de las d-tuplas
+        self.psi2_previous = 0.0                # Chi-Cuadrado de las (d-1)-tuplas
+        self.degrees_freedom = 0                # Grados de libertad: k^d - k^(d-1)
+        self.total_sum = 0.0                    # Estadístico psi2(d) - psi2(d - 1)
+        self.chi_reverse = 0.0                  # Valor crítico de Chi-Cuadrado
+        self.passed = False                     # Resultado de la prueba
+
+    # Entrega las claves enteras de las tuplas circulares por bloques: cada número se convierte
+    # en su intervalo floor(r * k) y la tupla en el número de celda sum(digito_j * k^(d-1-j))
+    def iter_tuple_keys(self):
+        values = np.asarray(self.ri_nums, dtype=np.float64)
+        k = self.intervals_amount
+        extra = self.dimension - 1
+        for start in range(0, self.n, self.chunk_size):
+            stop = min(start + self.chunk_size, self.n)
+            segment = values[start:stop + extra]
+            if stop + extra > self.n:
+                # Las últimas tuplas continúan con los primeros números de la secuencia
+                segment = np.concatenate([segment, values[:stop + extra - self.n]])
+            digits = np.clip((segment * k).astype(np.int64), 0, k - 1)
+            size = stop - start
+            keys = digits[:size].copy()
+            for j in range(1, self.dimension):
+                keys *= k
+                keys += digits[j:j + size]
+            yield keys
+
+    # Cuenta las tuplas de cada celda, en un histograma denso o solo en las celdas ocupadas
+    def count_tuples(self):
+        if not self.sparse:
+            self.keys = None
+            self.counts = np.zeros(self.cells, dtype=np.int64)
+            for keys in self.iter_tuple_keys():
+                self.counts += np.bincount(keys, minlength=self.cells)
+            self.occupied_cells = int(np.count_nonzero(self.counts))
+            return self.counts
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        for keys in self.iter_tuple_keys():
+            self.keys, self.counts = merge_counts(self.keys, self.counts, *np.unique(keys, return_counts=True))
+        self.occupied_cells = int(self.keys.size)
+        return self.counts
+
+    # Calcula psi2 de las d-tuplas y de las (d-1)-tuplas. Las (d-1)-tuplas circulares son los
+    # prefijos de las d-tuplas, así que sus conteos salen de agrupar las celdas por clave // k
+    # (en el caso disperso las claves están ordenadas y cada prefijo es un tramo contiguo).
+    def calculate_psi2(self):
+        k = self.intervals_amount
+        previous_cells = self.cells // k
+        self.psi2 = uniform_chi_square(self.counts, self.cells, self.n)
+        if self.sparse:
+            prefixes = self.keys // k
+            starts = np.flatnonzero(np.r_[True, prefixes[1:] != prefixes[:-1]])
+            previous_counts = np.add.reduceat(self.counts, starts) if starts.size else self.counts
+        else:
+            previous_counts = self.counts.reshape(previous_cells, k).sum(axis=1)
+        self.psi2_previous = uniform_chi_square(previous_counts, previous_cells, self.n)
+
+    # Realiza la prueba serial y determina si ha pasado
+    def check_serial(self):
+        if self.n < self.dimension:
+            raise ValueError("La prueba serial necesita al menos dimension números")
+        self.count_tuples()
+        self.calculate_psi2()
+        self.total_sum = self.psi2 - self.psi2_previous
+        self.degrees_freedom = self.cells - self.cells // self.intervals_amount
+        self.chi_reverse = chi2_ppf(1 - self.alpha, self.degrees_freedom)
+        self.passed = self.total_sum <= self.chi_reverse
+        return self.passed
+
+# Mezcla dos conteos dispersos con claves ordenadas y sin repetir: suma los conteos de las claves
+# que ya existen (modificando counts) e inserta las nuevas en su posición, sin volver a ordenar todo.
+def merge_counts(keys, counts, new_keys, new_counts):
+    positions = np.searchsorted(keys, new_keys)
+    found = positions < keys.size
+    found[found] = keys[positions[found]] == new_keys[found]
+    # Las claves nuevas no se repiten, así que sus posiciones tampoco y basta una suma indexada
+    counts[positions[found]] += new_counts[found]
+    missing = ~found
+    return np.insert(keys, positions[missing], new_keys[missing]), np.insert(counts, positions[missing], new_counts[missing])
+
+if __name__ == "__main__":
+    # Solicita al usuario que ingrese los números Ri separados por comas
+    user_input = input("Ingresa los números Ri separados por comas: ")
+    try:
+        ri_nums = [float(x.strip()) for x in user_input.split(",")]
+    except ValueError:
+        print("Error: asegúrate de ingresar únicamente números separados por comas.")
+        exit(1)
+
+    for dimension in (2, 3):
+        serial_test = SerialTest(ri_nums, intervals_amount=4, dimension=dimension)
+        serial_test.check_serial()
+        print(f"Dimensión {dimension}: estadístico = {serial_test.total_sum}, "
+              f"Chi2 crítico = {serial_test.chi_reverse}, ¿Prueba superada?: {serial_test.passed}")
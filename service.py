@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+from battery import Battery, TEST_NAMES, test_record
+from binary_loader import BINARY_DTYPES
+
+# Ejecuta las pruebas indicadas con una sola batería y retorna sus filas de resultados.
+# Con --processes es la única tarea de cada solicitud: la secuencia se copia una vez al
+# proceso trabajador y la batería calcula ahí los valores compartidos.
+def run_battery_task(ri_values, tests, params):
+    return Battery(ri_values, **params).run(tests).records()
+
+# Calcula una sola vez los valores compartidos de la batería (promedio, varianza, vista ordenada).
+# Retorna una lista vacía de filas para usarse como las demás tareas del servicio.
+def share_values(battery, sort):
+    battery.calculate_shared_values(sort)
+    return []
+
+# Ejecuta una sola prueba sobre una batería con los valores compartidos ya calculados
+def run_test_step(battery, name):
+    return [test_record(name, battery.run_test(name))]
+
+class HttpError(Exception):
+    """
+    Error de una solicitud que se responde con el código HTTP indicado.
+    """
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class TestService:
+    """
+    Servicio asyncio que recibe secuencias por HTTP (TCP o socket Unix local) y responde con el
+    resultado de cada prueba a medida que termina, como líneas JSON en una respuesta por partes.
+    Las pruebas corren en un grupo de hilos (o de procesos) para no bloquear el ciclo de eventos.
+    max_concurrent limita las solicitudes en ejecución; las demás esperan su turno hasta max_pending
+    y, por encima de eso, se rechazan con 503. El cuerpo solo se lee cuando la solicitud obtiene
+    su turno, así que la memoria usada por los cuerpos está acotada por max_concurrent * max_body.
+    Los encabezados deben llegar antes de head_timeout segundos (y son como máximo max_headers) y
+    el cuerpo antes de body_timeout; si no, se responde 408 y se libera el turno, para que un
+    cliente detenido no bloquee a los demás.
+
+    Uso: POST /test?tests=chi2,ks&intervals=8&ks_intervals=10&a=8&b=10&alpha=0.05&format=text
+    con los números en el cuerpo (texto separado por comas/espacios o binario float64/float32/uint32).
+    """
+    def __init__(self, workers=None, processes=False, max_concurrent=4, max_pending=64, max_body=256 * 2 ** 20,
+                 max_headers=100, head_timeout=10.0, body_timeout=60.0):
+        if processes:
+            # Los procesos se inician con "spawn" para que no hereden los sockets de las conexiones
+            # abiertas (con "fork", la conexión que crea el grupo no se cerraría hasta que terminen)
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers)  # Grupo donde corren las pruebas
+        self.processes = processes          # Si es True, cada solicitud corre completa en un proceso
+        self.semaphore = asyncio.Semaphore(max_concurrent)      # Límite de solicitudes en ejecución
+        self.max_pending = max_pending      # Máximo de solicitudes esperando turno
+        self.max_body = max_body            # Tamaño máximo del cuerpo en bytes
+        self.max_headers = max_headers      # Máximo de encabezados por solicitud
+        self.head_timeout = head_timeout    # Segundos para recibir la línea de solicitud y los encabezados
+        self.body_timeout = body_timeout    # Segundos para recibir el cuerpo una vez obtenido el turno
+        self.pending = 0                    # Solicitudes esperando turno
+
+    # Lee una línea de la solicitud; una línea más larga que el límite del flujo se responde con 431
+    async def read_line(self, reader):
+        try:
+            return (await reader.readline()).decode("latin-1").strip()
+        except ValueError:
+            raise HttpError(431, "Línea de solicitud o encabezado demasiado larga")
+
+    # Lee la línea de solicitud y los encabezados (el cuerpo se lee después, al obtener turno)
+    async def read_head(self, reader):
+        parts = (await self.read_line(reader)).split()
+        if len(parts) != 3:
+            raise HttpError(400, "Solicitud inválida")
+        method, target, _ = parts
+        headers = {}
+        for count in range(self.max_headers + 1):
+            line = await self.read_line(reader)
+            if not line:
+                break
+            if count == self.max_headers:
+                raise HttpError(431, f"La solicitud supera el máximo de {self.max_headers} encabezados")
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        return method, target, headers
+
+    # Valida el encabezado Content-Length y retorna el tamaño del cuerpo
+    def content_length(self, headers):
+        try:
+            length = int(headers["content-length"])
+        except (KeyError, ValueError):
+            raise HttpError(400, "Falta Content-Length o no es un número entero")
+        if length < 0:
+            raise HttpError(400, "Content-Length no puede ser negativo")
+        if length > self.max_body:
+            raise HttpError(413, f"El cuerpo supera el máximo de {self.max_body} bytes")
+        return length
+
+    # Convierte los parámetros de la consulta en las pruebas, los parámetros de Battery y el formato
+    def parse_query(self, target):
+        query = {key: values[-1] for key, values in parse_qs(urlsplit(target).query).items()}
+        tests = [name for name in query.get("tests", ",".join(TEST_NAMES)).split(",") if name]
+        unknown = set(tests) - set(TEST_NAMES)
+        if unknown:
+            raise HttpError(400, f"Pruebas desconocidas: {sorted(unknown)}")
+        if not tests:
+            raise HttpError(400, "No se indicó ninguna prueba")
+        input_format = query.get("format", "text")
+        if input_format != "text" and input_format not in BINARY_DTYPES:
+            raise HttpError(400, f"Formato desconocido: {input_format}")
+        try:
+            params = {
+                "intervals_amount": int(query.get("intervals", 8)),
+                "a": float(query.get("a", 8)),
+                "b": float(query.get("b", 10)),
+                "ks_intervals": int(query.get("ks_intervals", 10)),
+                "alpha": float(query.get("alpha", 0.05)),
+            }
+        except ValueError as error:
+            raise HttpError(400, f"Parámetros inválidos: {error}")
+        if not 0 < params["alpha"] < 1:
+            raise HttpError(400, "alpha debe estar entre 0 y 1")
+        if params["intervals_amount"] < 1 or params["ks_intervals"] < 1:
+            raise HttpError(400, "La cantidad de intervalos debe ser positiva")
+        if not (np.isfinite(params["a"]) and np.isfinite(params["b"])):
+            raise HttpError(400, "a y b deben ser números finitos")
+        return tests, params, input_format
+
+    # Convierte el cuerpo en la secuencia de números
+    def parse_body(self, body, input_format):
+        try:
+            if input_format == "text":
+                ri_values = np.array(body.decode().replace(",", " ").split(), dtype=np.float64)
+            else:
+                ri_values = np.frombuffer(body, dtype=BINARY_DTYPES[input_format])
+                if input_format == "uint32":
+                    ri_values = ri_values * (1.0 / 2 ** 32)
+        except (ValueError, UnicodeDecodeError) as error:
+            raise HttpError(400, f"Datos inválidos: {error}")
+        if ri_values.size < 2:
+            # Las pruebas de varianza y de corridas necesitan al menos 2 números
+            raise HttpError(400, f"La secuencia tiene {ri_values.size} números y se necesitan al menos 2")
+        if not np.all(np.isfinite(ri_values)):
+            raise HttpError(400, "La secuencia contiene valores no finitos")
+        return ri_values
+
+    # Escribe una respuesta completa (no por partes)
+    async def send_response(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 408: "Request Timeout",
+                  413: "Payload Too Large", 431: "Request Header Fields Too Large",
+                  503: "Service Unavailable"}.get(status, "Error")
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    # Envía una línea JSON como una parte de la respuesta; drain aplica contrapresión a clientes lentos
+    async def send_chunk(self, writer, payload):
+        data = (json.dumps(payload) + "\n").encode()
+        writer.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+    # Ejecuta una función en el grupo y retorna sus filas de resultados. Si falla, retorna una
+    # fila de error por cada prueba afectada para que la respuesta termine de forma ordenada.
+    async def run_job(self, names, function, *args):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        except Exception as error:
+            return [{"test": name, "passed": False, "error": f"{type(error).__name__}: {error}"} for name in names]
+
+    # Ejecuta las pruebas en el grupo y envía cada resultado apenas termina. Con hilos, los valores
+    # compartidos de la batería se calculan una sola vez y cada prueba es una tarea; con procesos,
+    # la batería completa corre en una sola tarea para no copiar la secuencia por cada prueba.
+    async def stream_results(self, writer, ri_values, tests, params):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        errors = []
+        if self.processes:
+            jobs = [self.run_job(tests, run_battery_task, ri_values, tests, params)]
+        else:
+            battery = Battery(ri_values, **params)
+            errors = await self.run_job(tests, share_values, battery, "chi2" in tests or "ks" in tests)
+            jobs = [] if errors else [self.run_job([name], run_test_step, battery, name) for name in tests]
+        passed = not errors
+        for record in errors:
+            await self.send_chunk(writer, record)
+        for job in asyncio.as_completed(jobs):
+            for record in await job:
+                passed = passed and record["passed"]
+                await self.send_chunk(writer, record)
+        await self.send_chunk(writer, {"test": "battery", "n": int(ri_values.size), "passed": passed})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    # Atiende una conexión: una solicitud por conexión. La solicitud espera su turno antes de
+    # leer el cuerpo, así que las solicitudes en espera solo ocupan sus encabezados en memoria.
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, target, headers = await asyncio.wait_for(self.read_head(reader), self.head_timeout)
+            except asyncio.TimeoutError:
+                raise HttpError(408, "Los encabezados no llegaron a tiempo")
+            path = urlsplit(target).path
+            if method == "GET" and path == "/health":
+                await self.send_response(writer, 200, {"status": "ok", "pending": self.pending})
+                return
+            if method != "POST" or path != "/test":
+                raise HttpError(404, "Usa POST /test o GET /health")
+            length = self.content_length(headers)
+            tests, params, input_format = self.parse_query(target)
+            if self.pending >= self.max_pending:
+                raise HttpError(503, "Demasiadas solicitudes en espera")
+            self.pending += 1
+            try:
+                await self.semaphore.acquire()
+            finally:
+                self.pending -= 1
+            try:
+                try:
+                    body = await asyncio.wait_for(reader.readexactly(length), self.body_timeout) if length else b""
+                except asyncio.TimeoutError:
+                    raise HttpError(408, "El cuerpo no llegó a tiempo")
+                ri_values = self.parse_body(body, input_format)
+                await self.stream_results(writer, ri_values, tests, params)
+            finally:
+                self.semaphore.release()
+        except HttpError as error:
+            await self.send_response(writer, error.status, {"error": str(error)})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    # Inicia el servidor en un socket Unix (si se indica) o en host:port
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local que ejecuta las pruebas de números pseudoaleatorios.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección de escucha (por defecto 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto de escucha (por defecto 8765)")
+    parser.add_argument("--unix", help="Ruta de un socket Unix en lugar de TCP")
+    parser.add_argument("--workers", type=int, help="Hilos o procesos del grupo (por defecto según los núcleos)")
+    parser.add_argument("--processes", action="store_true", help="Usa un grupo de procesos en lugar de hilos")
+    parser.add_argument("--max-concurrent", type=int, default=4, help="Solicitudes ejecutándose a la vez (por defecto 4)")
+    parser.add_argument("--max-pending", type=int, default=64, help="Solicitudes en espera antes de responder 503")
+    parser.add_argument("--max-body-mb", type=float, default=256, help="Tamaño máximo del cuerpo en MiB")
+    parser.add_argument("--max-headers", type=int, default=100, help="Máximo de encabezados por solicitud")
+    parser.add_argument("--head-timeout", type=float, default=10.0, help="Segundos para recibir los encabezados")
+    parser.add_argument("--body-timeout", type=float, default=60.0, help="Segundos para recibir el cuerpo")
+    args = parser.parse_args(argv)
+
+    async def run():
+        service = TestService(args.workers, args.processes, args.max_concurrent, args.max_pending,
+                              int(args.max_body_mb * 2 ** 20), args.max_headers, args.head_timeout,
+                              args.body_timeout)
+        await service.serve(args.host, args.port, args.unix)
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
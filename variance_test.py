@@ -1,6 +1,7 @@
 from numpy import mean, var
-import scipy.stats as st
-import matplotlib.pyplot as plt
+from critical_values import chi2_ppf
+from plotting import pyplot, show_or_save
+from running_moments import RunningMoments
 
 class VarianceTest:
     """
@@ -26,10 +27,10 @@ class VarianceTest:
         self.average = mean(self.ri_numbers)
 
     def calculateChiSquare1(self):
-        self.chi_square1 = st.chi2.ppf(self.alpha / 2, self.n - 1)
+        self.chi_square1 = chi2_ppf(self.alpha / 2, self.n - 1)
 
     def calculateChiSquare2(self):
-        self.chi_square2 = st.chi2.ppf(1 - self.alpha / 2, self.n - 1)
+        self.chi_square2 = chi2_ppf(1 - self.alpha / 2, self.n - 1)
 
     def calculateInferiorLimit(self):
         self.inferior_limit = self.chi_square1 / (12 * (self.n - 1))
@@ -49,7 +50,8 @@ class VarianceTest:
         else:
             self.passed = False
 
-    def plotLimitsAndVariance(self):
+    def plotLimitsAndVariance(self, path=None):
+        plt = pyplot(headless=path is not None)
         x = ["Límite Inferior", "Varianza", "Límite Superior"]
         y = [self.inferior_limit, self.variance, self.superior_limit]
         fig, ax = plt.subplots()
@@ -61,7 +63,7 @@ class VarianceTest:
             height = bar.get_height()
             ax.annotate(f'{height:.4f}', xy=(bar.get_x() + bar.get_width() / 2, height),
                         xytext=(0, 1), textcoords="offset points", ha='center', va='bottom')
-        plt.show()
+        show_or_save(plt, path)
 
     def clear(self):
         self.variance = 0.0
@@ -74,6 +76,45 @@ class VarianceTest:
         self.chi_square1 = 0.0
         self.chi_square2 = 0.0
 
+class OnlineVarianceTest(VarianceTest):
+    """
+    Prueba de Varianza en línea: acumula los números por bloques sin guardarlos
+    y puede evaluarse en cualquier momento con los valores recibidos hasta ese punto.
+    """
+    def __init__(self):
+        super().__init__([])
+        self.moments = RunningMoments()     # Acumulador de cantidad, promedio y M2
+
+    # Agrega un bloque de números y actualiza la cantidad
+    def update(self, numbers):
+        self.moments.update(numbers)
+        self.n = self.moments.n
+
+    # Combina con otra prueba en línea (por ejemplo, de otro proceso trabajador)
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.n = self.moments.n
+
+    def calculateVariance(self):
+        self.variance = self.moments.variance()
+
+    def calculateAverage(self):
+        self.average = self.moments.mean
+
+    # Evalúa la prueba con los números recibidos hasta ahora. Los límites usan n - 1 grados de
+    # libertad, así que con menos de 2 números no hay límites y la prueba no se supera.
+    def checkTest(self):
+        if self.n < 2:
+            self.calculateAverage()
+            self.calculateVariance()
+            self.chi_square1 = 0.0
+            self.chi_square2 = 0.0
+            self.superior_limit = 0.0
+            self.inferior_limit = 0.0
+            self.passed = False
+            return
+        super().checkTest()
+
 if __name__ == "__main__":
     # Solicita al usuario que ingrese los números separados por comas
     user_input = input("Ingresa los números separados por comas: ")
@@ -0,0 +1,122 @@
+from collections import deque
+import numpy as np
+from average_test import OnlineAverageTest
+from variance_test import OnlineVarianceTest
+from critical_values import chi2_ppf
+from out_of_core import iter_chunks
+from running_moments import RunningMoments
+
+# Divide la fuente en bloques de exactamente size valores.
+# Un arreglo NumPy se recorre con vistas sin copia; un iterable de bloques (o de números sueltos,
+# que iter_chunks agrupa con numpy.fromiter) se reagrupa guardando los bloques pendientes en una
+# lista y concatenándolos una sola vez por cada bloque completo.
+# El último bloque incompleto se descarta porque no llena una ventana.
+def iter_blocks(source, size):
+    if isinstance(source, np.ndarray):
+        for start in range(0, source.size - size + 1, size):
+            yield source[start:start + size]
+        return
+    pending = []
+    pending_size = 0
+    for chunk in iter_chunks(source, size):
+        pending.append(chunk)
+        pending_size += chunk.size
+        if pending_size >= size:
+            values = np.concatenate(pending)
+            full = values.size - values.size % size
+            for start in range(0, full, size):
+                yield values[start:start + size]
+            pending = [values[full:]]
+            pending_size = values.size - full
+
+class BlockSummary:
+    """
+    Resumen de un bloque de la ventana: momentos y conteos por intervalo de los Ri en [0, 1).
+    """
+    def __init__(self, block, intervals_amount):
+        self.moments = RunningMoments().update(block)
+        bins = np.clip((block * intervals_amount).astype(np.int64), 0, intervals_amount - 1)
+        self.counts = np.bincount(bins, minlength=intervals_amount)
+
+class WindowedTests:
+    """
+    Detección de deriva: ejecuta las pruebas de promedio, varianza y Chi-Cuadrado sobre ventanas
+    de una secuencia larga. Con step < window las ventanas se solapan; con step == window son
+    consecutivas. Cada bloque de step valores se resume una sola vez y, al deslizar la ventana,
+    solo se agrega el bloque nuevo y se quita el más antiguo.
+    La prueba de Chi-Cuadrado usa intervalos fijos de igual tamaño en [0, 1) para poder
+    reutilizar los conteos entre ventanas.
+    """
+    def __init__(self, window=100000, step=None, intervals_amount=8, alpha=0.05):
+        step = window if step is None else step
+        if step <= 0 or window % step != 0:
+            raise ValueError("El tamaño de la ventana debe ser un múltiplo positivo del paso")
+        self.window = window                    # Cantidad de números por ventana
+        self.step = step                        # Desplazamiento entre ventanas consecutivas
+        self.intervals_amount = intervals_amount  # Intervalos de la prueba de Chi-Cuadrado
+        self.alpha = alpha                      # Nivel de significancia de las pruebas
+        self.series = []                        # Estadísticos y resultados de cada ventana
+        self.first_failure = None               # Primera ventana que no pasa alguna prueba
+
+    # Evalúa una ventana a partir de los resúmenes de sus bloques y de sus conteos acumulados
+    def evaluate_window(self, index, blocks, counts):
+        moments = RunningMoments()
+        for block in blocks:
+            moments.merge(block.moments)
+        average_test = OnlineAverageTest()
+        average_test.alpha = self.alpha
+        average_test.moments = moments
+        average_test.n = moments.n
+        average_test.evaluate_test()
+        variance_test = OnlineVarianceTest()
+        variance_test.alpha = self.alpha
+        variance_test.moments = moments
+        variance_test.n = moments.n
+        variance_test.checkTest()
+        expected = moments.n / self.intervals_amount
+        chi2 = float(np.sum((counts - expected) ** 2) / expected)
+        chi2_critical = chi2_ppf(1 - self.alpha, self.intervals_amount - 1)
+        start = index * self.step
+        row = {
+            "window": index,
+            "start": start,
+            "end": start + self.window,
+            "average": average_test.average,
+            "average_passed": bool(average_test.passed),
+            "variance": variance_test.variance,
+            "variance_passed": bool(variance_test.passed),
+            "chi2": chi2,
+            "chi2_critical": chi2_critical,
+            "chi2_passed": chi2 <= chi2_critical,
+        }
+        row["passed"] = row["average_passed"] and row["variance_passed"] and row["chi2_passed"]
+        return row
+
+    # Recorre la fuente y entrega los resultados de cada ventana a medida que se completan
+    def iter_windows(self, source):
+        blocks_per_window = self.window // self.step
+        blocks = deque()
+        counts = np.zeros(self.intervals_amount, dtype=np.int64)
+        index = 0
+        for block in iter_blocks(source, self.step):
+            summary = BlockSummary(block, self.intervals_amount)
+            blocks.append(summary)
+            counts += summary.counts
+            if len(blocks) > blocks_per_window:
+                counts -= blocks.popleft().counts
+            if len(blocks) == blocks_per_window:
+                yield self.evaluate_window(index, blocks, counts)
+                index += 1
+
+    # Evalúa todas las ventanas, guarda la serie y la primera ventana que falla.
+    # Con stop_on_failure=True se detiene en la primera falla.
+    def run(self, source, stop_on_failure=False):
+        self.series = []
+        self.first_failure = None
+        for row in self.iter_windows(source):
+            self.series.append(row)
+            if not row["passed"] and self.first_failure is None:
+                self.first_failure = row
+                if stop_on_failure:
+                    break
+        return self.series